@@ -0,0 +1,69 @@
+"""
+Compare per-model latency of the subprocess and in-process dbt engines.
+
+Run from inside a dbt project whose models have been built:
+
+    python benchmarks/bench_dbt_backends.py stg_customers stg_orders -t dev
+
+For every engine the script resolves each model's path with ``dbt ls`` and
+introspects it with the dbt-yamer generation macro, one model per call, and
+reports the first (cold) call separately from the per-model average.
+"""
+import argparse
+import statistics
+import time
+
+from dbt_yamer.exceptions import DbtYamerError
+from dbt_yamer.handlers.file_handlers import find_dbt_project_root, get_unique_temp_macro_path
+from dbt_yamer.macros.macro_content import generate_yaml_macro
+from dbt_yamer.utils.dbt_runner import ENGINES, create_dbt_backend
+
+
+def _time_calls(backend, calls, project_dir):
+    timings = []
+    for cmd_args in calls:
+        start = time.perf_counter()
+        backend.invoke(cmd_args, timeout=600, cwd=str(project_dir))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="+", help="Models to introspect")
+    parser.add_argument("-t", "--target", default=None, help="dbt target")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    args = parser.parse_args()
+
+    project_dir = find_dbt_project_root()
+    target_args = ["-t", args.target] if args.target else []
+    calls = []
+    for model in args.models:
+        calls.append(["--quiet", "ls", "--resource-types", "model", "--select", model, "--output", "path"] + target_args)
+        calls.append(["--quiet", "run-operation", "dbt_yamer_generate_contract_yaml",
+                      "--args", '{"model_names": ["%s"]}' % model] + target_args)
+
+    temp_macro_path, _ = get_unique_temp_macro_path(project_dir / "macros")
+    temp_macro_path.write_text(generate_yaml_macro, encoding="utf-8")
+    try:
+        print(f"{'engine':<12} {'cold call (s)':>14} {'per model (s)':>14} {'total (s)':>10}")
+        for engine in args.engines:
+            backend = create_dbt_backend(engine)
+            if backend.name != engine:
+                print(f"{engine:<12} unavailable")
+                continue
+            try:
+                timings = _time_calls(backend, calls, project_dir)
+            except DbtYamerError as e:
+                print(f"{engine:<12} failed: {e}")
+                continue
+            # Each model costs one `ls` and one `run-operation`
+            per_model = [a + b for a, b in zip(timings[0::2], timings[1::2])]
+            warm = per_model[1:] or per_model
+            print(f"{engine:<12} {timings[0]:>14.3f} {statistics.mean(warm):>14.3f} {sum(timings):>10.3f}")
+    finally:
+        temp_macro_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Import-time regression check for the dbt-yamer CLI.
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 120 --repeat 10
+
+Each invocation is run under ``python -X importtime`` (with the daemon
+bypassed) and the best total import time over ``--repeat`` runs is compared
+with the budget. Invocations that must not load the heavy dependencies are
+also checked for them, which catches regressions independently of machine
+speed. Exits non-zero if any check fails.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# (arguments, modules that must stay unloaded)
+INVOCATIONS = [
+    (["--help"], ["yaml", "fuzzywuzzy", "Levenshtein", "rapidfuzz", "sqlite3", "concurrent.futures"]),
+    (["run", "--help"], ["yaml", "fuzzywuzzy", "Levenshtein", "rapidfuzz", "sqlite3", "concurrent.futures"]),
+    (["yaml", "--help"], ["yaml", "fuzzywuzzy", "Levenshtein", "rapidfuzz", "sqlite3"]),
+    (["md", "--help"], ["yaml", "fuzzywuzzy", "Levenshtein", "rapidfuzz", "sqlite3"]),
+]
+
+
+def _import_profile(cli_args):
+    """Return ({module: cumulative us}, total top-level us) for one CLI run."""
+    env = dict(os.environ, DBT_YAMER_NO_DAEMON="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "dbt_yamer.cli.main"] + cli_args,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return modules, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum total import time per invocation")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per invocation; the best one is kept")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'invocation':<16} {'imports (ms)':>12}  result")
+    for cli_args, forbidden in INVOCATIONS:
+        profiles = [_import_profile(cli_args) for _ in range(max(1, args.repeat))]
+        modules, total = min(profiles, key=lambda profile: profile[1])
+        loaded = [module for module in forbidden if module in modules]
+
+        problems = []
+        if total / 1000 > args.budget_ms:
+            problems.append(f"over {args.budget_ms:.0f} ms budget")
+        if loaded:
+            problems.append(f"loads {', '.join(loaded)}")
+        failed = failed or bool(problems)
+
+        print(f"{' '.join(cli_args):<16} {total / 1000:>12.1f}  {'; '.join(problems) or 'ok'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
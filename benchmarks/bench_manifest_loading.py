@@ -0,0 +1,133 @@
+"""
+Compare manifest loading strategies by load time and peak memory.
+
+    python benchmarks/bench_manifest_loading.py target/manifest.json
+    python benchmarks/bench_manifest_loading.py --synthetic-nodes 50000
+
+Every strategy runs in a fresh interpreter, so the reported peak RSS is that
+of a process that only loaded the manifest. "full" strategies parse the whole
+file; "sections" strategies load only the keys dbt-yamer needs to generate
+YAML (metadata, nodes, sources, docs). Backends that are not installed are skipped.
+The last row loads the compiled manifest index from its sidecar file, which
+is what later runs do while the manifest is unchanged.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from dbt_yamer.handlers.docblock import GENERATION_SECTIONS, _manifest_backends
+from dbt_yamer.handlers.manifest_index import INDEX_SIDECAR_NAME
+
+STRATEGIES = [
+    ("json", False), ("orjson", False),
+    ("json", True), ("orjson", True), ("ijson", True),
+    ("sidecar", True),
+]
+
+_CHILD = """
+import resource, sys, time
+from pathlib import Path
+from dbt_yamer.handlers.docblock import GENERATION_SECTIONS, read_manifest
+from dbt_yamer.handlers.manifest_index import load_manifest_index
+start = time.perf_counter()
+if sys.argv[2] == "sidecar":
+    nodes = len(load_manifest_index(Path(sys.argv[1]), Path(sys.argv[4]))._upstream)
+else:
+    manifest = read_manifest(sys.argv[1], GENERATION_SECTIONS if sys.argv[3] == "1" else None, backend=sys.argv[2])
+    nodes = len(manifest.get("nodes", {}))
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, nodes)
+"""
+
+
+def write_synthetic_manifest(path, nodes):
+    """Write a manifest with ``nodes`` models and the bulky sections dbt adds."""
+    def node(index):
+        name = f"model_{index}"
+        return {
+            "resource_type": "model", "name": name, "package_name": "bench",
+            "unique_id": f"model.bench.{name}", "original_file_path": f"models/{name}.sql",
+            "tags": ["nightly"], "config": {"tags": [], "materialized": "table"},
+            "checksum": {"name": "sha256", "checksum": "0" * 64},
+            "depends_on": {"nodes": [f"model.bench.model_{index - 1}"] if index else [], "macros": []},
+            "raw_code": "select 1 as id\n" * 40,
+            "compiled_code": "select 1 as id\n" * 40,
+            "columns": {f"col_{c}": {"name": f"col_{c}", "description": "", "data_type": "int"} for c in range(10)},
+        }
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"metadata": {"project_name": "bench"}, "nodes": {')
+        f.write(", ".join(f'"model.bench.model_{i}": {json.dumps(node(i))}' for i in range(nodes)))
+        f.write('}, "docs": ')
+        json.dump({f"doc.bench.col_{c}": {"name": f"col_{c}", "block_contents": "x"} for c in range(200)}, f)
+        f.write(', "macros": ')
+        json.dump({f"macro.dbt.m_{i}": {"name": f"m_{i}", "macro_sql": "{% macro m() %}{% endmacro %}" * 20}
+                   for i in range(nodes // 2)}, f)
+        f.write(', "child_map": ')
+        json.dump({f"model.bench.model_{i}": [f"model.bench.model_{i + 1}"] for i in range(nodes)}, f)
+        f.write(', "parent_map": ')
+        json.dump({f"model.bench.model_{i}": [f"model.bench.model_{i - 1}"] for i in range(nodes)}, f)
+        f.write("}")
+
+
+def _run_child(manifest_path, backend, sections, project_dir):
+    return subprocess.run(
+        [sys.executable, "-c", _CHILD, manifest_path, backend, "1" if sections else "0", str(project_dir)],
+        capture_output=True, text=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", nargs="?", help="Manifest to load")
+    parser.add_argument("--synthetic-nodes", type=int, default=20000,
+                        help="Size of the generated manifest when no path is given")
+    args = parser.parse_args()
+
+    temp_dir = None
+    manifest_path = args.manifest
+    if manifest_path is None:
+        temp_dir = tempfile.mkdtemp()
+        manifest_path = os.path.join(temp_dir, "manifest.json")
+        Path(temp_dir, "dbt_project.yml").write_text("name: bench\n")
+        write_synthetic_manifest(manifest_path, args.synthetic_nodes)
+    # target/manifest.json lives one level below dbt_project.yml
+    project_dir = Path(manifest_path).parent if temp_dir else Path(manifest_path).resolve().parent.parent
+
+    sidecar_path = Path(manifest_path).parent / INDEX_SIDECAR_NAME
+    sidecar_existed = sidecar_path.exists()
+    try:
+        size_mb = os.path.getsize(manifest_path) / 1e6
+        print(f"{manifest_path} ({size_mb:.0f} MB), sections: {', '.join(GENERATION_SECTIONS)}")
+        print(f"{'backend':<8} {'loads':<9} {'time (s)':>9} {'peak RSS (MB)':>14} {'nodes':>8}")
+
+        # Build the sidecar up front so its row measures a warm run. This
+        # happens in a child too: ru_maxrss survives fork, so a large parent
+        # would inflate every measurement.
+        _run_child(manifest_path, "sidecar", True, project_dir)
+        available = _manifest_backends() + ["sidecar"]
+        for backend, sections in STRATEGIES:
+            scope = "index" if backend == "sidecar" else "sections" if sections else "full"
+            if backend not in available:
+                print(f"{backend:<8} {scope:<9} {'not installed':>9}")
+                continue
+            result = _run_child(manifest_path, backend, sections, project_dir)
+            if result.returncode != 0:
+                print(f"{backend:<8} {scope:<9} failed: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            elapsed, max_rss_kb, nodes = result.stdout.split()
+            print(f"{backend:<8} {scope:<9} {float(elapsed):>9.2f} {int(max_rss_kb) / 1024:>14.0f} {nodes:>8}")
+    finally:
+        if not sidecar_existed and sidecar_path.exists():
+            sidecar_path.unlink()
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
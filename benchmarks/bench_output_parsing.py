@@ -0,0 +1,83 @@
+"""
+Compare line-scraping and framed-payload extraction of run-operation output.
+
+    python benchmarks/bench_output_parsing.py
+    python benchmarks/bench_output_parsing.py --models 400 --columns 150 --log-lines 20
+
+Builds the same batched macro output twice: once as the legacy single YAML
+document surrounded by text log lines, once as per-model framed payloads
+between JSON log lines. Reports the best time of each extractor over
+``--repeat`` runs and checks that both recover the same models.
+"""
+import argparse
+import json
+import time
+
+from dbt_yamer.utils.dbt_utils import (
+    PAYLOAD_BEGIN, PAYLOAD_END, extract_framed_payloads, extract_yaml_from_dbt_output
+)
+
+
+def _model_lines(model, columns):
+    lines = [f"  - name: {model}", '    description: ""', "    config:", "      contract:",
+             "        enforced: true", "    columns:"]
+    for index in range(columns):
+        lines += [f"      - name: column_{index}", "        data_type: STRING", '        description: ""', ""]
+    return lines
+
+
+def build_outputs(models, columns, log_lines):
+    """Return (legacy output, framed output) for the same models."""
+    names = [f"model_{index}" for index in range(models)]
+
+    legacy = [f"12:00:{index % 60:02d} Running with dbt=1.7.0 [info] line {index}" for index in range(log_lines)]
+    legacy += ["version: 2", "", "models:"]
+    for name in names:
+        legacy += _model_lines(name, columns)
+    legacy += [f"12:01:00 Completed in {models} ms"]
+
+    log = json.dumps({"info": {"level": "info", "msg": "Running with dbt=1.7.0"}})
+    framed = [log] * log_lines
+    for name in names:
+        framed += [f"{PAYLOAD_BEGIN} {name}", "version: 2", "", "models:"]
+        framed += _model_lines(name, columns)
+        framed += [f"{PAYLOAD_END} {name}", log]
+
+    return "\n".join(legacy), "\n".join(framed)
+
+
+def _best_time(func, output, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(output)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--log-lines", type=int, default=50, help="dbt log lines around the payload")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy, framed = build_outputs(args.models, args.columns, args.log_lines)
+
+    legacy_time, legacy_yaml = _best_time(extract_yaml_from_dbt_output, legacy, args.repeat)
+    framed_time, payloads = _best_time(extract_framed_payloads, framed, args.repeat)
+
+    legacy_models = legacy_yaml.count("\n  - name: ") + legacy_yaml.startswith("  - name: ")
+    assert legacy_models == args.models, f"line scraping recovered {legacy_models} of {args.models} models"
+    assert len(payloads) == args.models, f"framing recovered {len(payloads)} of {args.models} models"
+
+    print(f"{'extractor':<16} {'output (MB)':>12} {'best (ms)':>10} {'MB/s':>10}")
+    for label, output, seconds in (("line scraping", legacy, legacy_time), ("framed slicing", framed, framed_time)):
+        megabytes = len(output.encode("utf-8")) / 1e6
+        print(f"{label:<16} {megabytes:>12.1f} {seconds * 1000:>10.1f} {megabytes / seconds:>10.0f}")
+    print(f"speed-up: {legacy_time / framed_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
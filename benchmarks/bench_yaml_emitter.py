@@ -0,0 +1,102 @@
+"""
+Compare the ways a generated model has been serialized to schema YAML.
+
+    python benchmarks/bench_yaml_emitter.py
+    python benchmarks/bench_yaml_emitter.py --columns 5000 --repeat 10
+
+Builds one model with ``--columns`` columns (doc block references, empty
+descriptions and long prose that PyYAML folds) and serializes it three
+ways: the original round trip (yaml.dump, then format_yaml's safe_load,
+format_columns and MyDumper dump), a single MyDumper dump of the in-memory
+document, and the single-pass emitter behind format_yaml_data. Checks that
+all three produce the same bytes and reports the best time of each.
+"""
+import argparse
+import random
+import time
+
+import yaml
+
+from dbt_yamer.handlers.yaml_handlers import _dump_schema, _emit_str, format_columns, format_yaml, format_yaml_data
+
+TYPES = ["INT64", "STRING", "NUMERIC", "TIMESTAMP", "double precision", "STRUCT<a INT64, b STRING>", "ARRAY"]
+WORDS = "the customer's order amount in usd as of the last refresh excluding refunds and taxes".split()
+
+
+def build_model(columns, seed):
+    """Return a model entry as the generation macro and doc blocks leave it."""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(columns):
+        kind = rng.random()
+        if kind < 0.4:
+            description = f'{{{{ doc("col_column_{index}") }}}}'
+        elif kind < 0.8:
+            description = ""
+        else:
+            description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30)))
+        entries.append({"name": f"column_{index}", "data_type": rng.choice(TYPES), "description": description})
+    return {
+        "name": "wide_model",
+        "description": "",
+        "config": {"contract": {"enforced": True}},
+        "columns": entries,
+    }
+
+
+def round_trip(model):
+    """The original path: dump the model, then parse and re-dump it in format_yaml."""
+    data = yaml.safe_load(yaml.dump({"version": 2, "models": [model]}, sort_keys=False, allow_unicode=True))
+    for entry in data["models"]:
+        entry["columns"] = format_columns(entry["columns"])
+    return _dump_schema(data)
+
+
+def single_dump(model):
+    """One MyDumper dump of the in-memory document."""
+    return _dump_schema({"version": 2, "models": [dict(model, columns=format_columns(model["columns"]))]})
+
+
+def emitter(model):
+    """The single-pass emitter used by format_yaml_data, with a cold scalar cache."""
+    _emit_str.cache_clear()
+    return format_yaml_data({"version": 2, "models": [model]})
+
+
+def _best_time(func, model, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(model)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = build_model(args.columns, args.seed)
+
+    results = [
+        (label,) + _best_time(func, model, args.repeat)
+        for label, func in (("round trip", round_trip), ("single dump", single_dump), ("emitter", emitter))
+    ]
+
+    expected = results[0][2]
+    assert format_yaml(yaml.dump({"version": 2, "models": [model]}, sort_keys=False)) == expected
+    for label, _, output in results[1:]:
+        assert output == expected, f"{label} output differs from the round trip"
+
+    round_trip_time = results[0][1]
+    print(f"{args.columns} columns, {len(expected.encode('utf-8')) / 1e3:.0f} kB of YAML, identical output")
+    print(f"{'serializer':<12} {'best (ms)':>10} {'speed-up':>9}")
+    for label, seconds, _ in results:
+        print(f"{label:<12} {seconds * 1000:>10.1f} {round_trip_time / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import click
+import sys
+import time
+
+from dbt_yamer.handlers.file_handlers import find_dbt_project_root
+from dbt_yamer.utils.daemon import DaemonServer, send_request, socket_path_for
+from dbt_yamer.exceptions import DbtYamerError
+
+# How long `daemon start` waits for the background daemon to finish warming up
+START_TIMEOUT = 300
+
+
+@click.group(name="daemon")
+def daemon():
+    """
+    Manage a warm background dbt-yamer process for this dbt project.
+
+    While it runs, `yaml`, `md` and `yamd` are executed by the daemon, which
+    keeps the manifest, indexes and parsed dbt project loaded between calls.
+    Commands run with the caller's environment; if its DBT_* variables differ
+    from the daemon's, they run locally instead. Set DBT_YAMER_NO_DAEMON=1 to
+    bypass it.
+
+    Example:
+      dbt-yamer daemon start
+      dbt-yamer daemon status
+      dbt-yamer daemon stop
+    """
+    pass
+
+
+def _project_dir():
+    try:
+        return find_dbt_project_root()
+    except DbtYamerError as e:
+        click.echo(f"❌ Error finding dbt project: {e}")
+        raise click.Abort()
+
+
+@daemon.command(name="start")
+@click.option(
+    "--manifest",
+    default="target/manifest.json",
+    show_default=True,
+    help="Path to the dbt manifest JSON file, relative to the project root."
+)
+@click.option(
+    "--target",
+    "-t",
+    default=None,
+    help="dbt target to preload."
+)
+@click.option(
+    "--foreground",
+    is_flag=True,
+    help="Serve in this process instead of starting a background daemon."
+)
+def start(manifest, target, foreground):
+    """Start the daemon for the current dbt project."""
+    project_dir = _project_dir()
+
+    if foreground:
+        try:
+            DaemonServer(project_dir, manifest, target).serve_forever()
+        except DbtYamerError as e:
+            click.echo(f"❌ {e}")
+            raise click.Abort()
+        except KeyboardInterrupt:
+            click.echo("👋 Daemon stopped")
+        return
+
+    reply = send_request(project_dir, {"command": "ping"})
+    if reply is not None:
+        click.echo(f"✅ Daemon already running (pid {reply.get('pid')})")
+        return
+
+    log_dir = project_dir / "target"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = log_dir / "dbt_yamer_daemon.log"
+
+    cmd_list = [sys.executable, "-m", "dbt_yamer.cli.main", "daemon", "start", "--foreground", "--manifest", manifest]
+    if target:
+        cmd_list.extend(["-t", target])
+
+    import subprocess
+
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        process = subprocess.Popen(
+            cmd_list,
+            cwd=str(project_dir),
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+
+    click.echo("⏳ Starting daemon and warming up the project...")
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            click.echo(f"❌ Daemon exited during start-up, see {log_path}")
+            raise click.Abort()
+        if socket_path_for(project_dir).exists():
+            reply = send_request(project_dir, {"command": "ping"})
+            if reply is not None:
+                click.echo(f"✅ Daemon running (pid {reply.get('pid')}), log: {log_path}")
+                return
+        time.sleep(0.2)
+
+    click.echo(f"⚠️  Daemon did not answer within {START_TIMEOUT}s, see {log_path}")
+
+
+@daemon.command(name="stop")
+def stop():
+    """Stop the daemon for the current dbt project."""
+    project_dir = _project_dir()
+    reply = send_request(project_dir, {"command": "shutdown"})
+    if reply is None:
+        click.echo("ℹ️  No daemon is running for this project")
+        return
+
+    # The daemon removes its socket once it has cleaned up
+    deadline = time.monotonic() + 10
+    while socket_path_for(project_dir).exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    click.echo(f"✅ Daemon (pid {reply.get('pid')}) stopped")
+
+
+@daemon.command(name="status")
+def status():
+    """Show whether a daemon is serving the current dbt project."""
+    project_dir = _project_dir()
+    reply = send_request(project_dir, {"command": "ping"})
+    if reply is None:
+        click.echo("ℹ️  No daemon is running for this project")
+        return
+    click.echo(f"✅ Daemon running (pid {reply.get('pid')}) for {reply.get('project')}")
+    click.echo(f"   Requests served: {reply.get('requests_served')}")
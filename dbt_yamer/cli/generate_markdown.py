@@ -1,8 +1,11 @@
 import click
 from pathlib import Path
-import subprocess
 from dbt_yamer.handlers.markdown_handlers import create_md_file
 from dbt_yamer.handlers.file_handlers import find_dbt_project_root
+from dbt_yamer.handlers.manifest_index import load_manifest_index
+from dbt_yamer.utils.dbt_utils import expand_tag_selectors, get_model_sql_path
+from dbt_yamer.utils.security_utils import SecurityError
+from dbt_yamer.exceptions import DbtYamerError
 
 @click.command(name="md")
 @click.option(
@@ -12,7 +15,13 @@ from dbt_yamer.handlers.file_handlers import find_dbt_project_root
     help="Use this flag before specifying models"
 )
 @click.argument('models', nargs=-1)
-def generate_markdown(select, models):
+@click.option(
+    "--manifest",
+    default="target/manifest.json",
+    show_default=True,
+    help="Path to the dbt manifest JSON file used to locate models (falls back to dbt ls)."
+)
+def generate_markdown(select, models, manifest):
     """
     Generate markdown documentation for one or more dbt models and place them next to their .sql sources.
 
@@ -46,40 +55,14 @@ def generate_markdown(select, models):
         click.echo(f"Error: {e}. Please run this command from within a dbt project.")
         return
 
-    # First, if we have a tag selector, get the list of models
-    processed_models = []
-    for model in models:
-        if model.startswith('tag:'):
-            click.echo(f"\nExpanding tag selector: {model}")
-            ls_cmd = [
-                "dbt",
-                "--quiet",
-                "ls",
-                "--select", model
-            ]
-            try:
-                ls_result = subprocess.run(
-                    ls_cmd,
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                # Split the fully qualified names and take the last part
-                tag_models = [
-                    path.split('.')[-1] 
-                    for path in ls_result.stdout.strip().splitlines()
-                ]
-                if not tag_models:
-                    click.echo(f"Warning: No models found for tag selector '{model}'")
-                    continue
-                processed_models.extend(tag_models)
-                click.echo(f"Found models for {model}: {', '.join(tag_models)}")
-            except subprocess.CalledProcessError as e:
-                click.echo(f"Error expanding tag selector '{model}':\n{e.stderr}")
-                continue
-        else:
-            processed_models.append(model)
+    manifest_index = load_manifest_index(project_dir / manifest, project_dir)
+
+    # Expand tag selectors from the manifest (dbt ls only without one)
+    try:
+        processed_models = expand_tag_selectors(list(models), manifest_index=manifest_index)
+    except (DbtYamerError, SecurityError) as e:
+        click.echo(f"Error expanding selectors: {e}")
+        return
 
     if not processed_models:
         click.echo("No models found to process after expanding selectors.")
@@ -88,34 +71,13 @@ def generate_markdown(select, models):
     for model in processed_models:
         click.echo(f"\nProcessing model: {model}")
         
-        ls_cmd = [
-            "dbt",
-            "--quiet",
-            "ls",
-            "--resource-types", "model",
-            "--select", model,
-            "--output", "path"
-        ]
-        
         try:
-            ls_result = subprocess.run(
-                ls_cmd,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-        except subprocess.CalledProcessError as e:
-            click.echo(f"❌ Unable to locate model '{model}':\n{e.stderr}")
-            continue
-
-        paths = ls_result.stdout.strip().splitlines()
-        if not paths:
-            click.echo(f"⚠️  Warning: Could not find path for '{model}' (dbt ls returned no results).")
+            sql_file_path = Path(get_model_sql_path(model, manifest_index=manifest_index))
+        except (DbtYamerError, SecurityError) as e:
+            click.echo(f"❌ Unable to locate model '{model}': {e}")
             continue
 
-        sql_file_path = Path(paths[0])
-        dir_for_sql = sql_file_path.parent
+        dir_for_sql = project_dir / sql_file_path.parent
         
         try:
             create_md_file(model, dir_for_sql)
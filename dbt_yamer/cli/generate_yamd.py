@@ -1,108 +1,35 @@
 import click
 from pathlib import Path
-import subprocess
-import tempfile
-import shutil
+from dbt_yamer.cli.generate_yaml import (
+    DEFAULT_BATCH_SIZE, generate_model_yamls, open_column_cache, report_doc_match_memo, report_generation_state,
+    save_doc_match_memo, save_generation_state
+)
 from dbt_yamer.handlers.markdown_handlers import create_md_file
 from dbt_yamer.handlers.file_handlers import find_dbt_project_root
-from dbt_yamer.handlers.docblock import load_manifest
-from dbt_yamer.macros.macro_content import generate_yaml_macro
-
-def generate_yaml_for_model(model, target=None):
-    """Helper function to generate YAML for a single model"""
-    try:
-        ls_cmd = [
-            "dbt",
-            "--quiet",
-            "ls",
-            "--resource-types", "model",
-            "--select", model,
-            "--output", "path"
-        ]
-        
-        ls_result = subprocess.run(
-            ls_cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        paths = ls_result.stdout.strip().splitlines()
-        if not paths:
-            click.echo(f"⚠️  Warning: Could not find .sql path for '{model}' (dbt ls returned no results).")
-            return None, None
-
-        sql_file_path = Path(paths[0])
-        dir_for_sql = sql_file_path.parent
-
-        args_dict_str = f'{{"model_names": ["{model}"]}}'
-        cmd_list = [
-            "dbt",
-            "--quiet",
-            "run-operation",
-            "dbt_yamer_generate_contract_yaml",
-            "--args", args_dict_str
-        ]
-        if target:
-            cmd_list.extend(["-t", target])
-
-        result = subprocess.run(
-            cmd_list,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        raw_yaml_output = result.stdout.strip()
-        if not raw_yaml_output:
-            click.echo(f"⚠️  No YAML output returned by dbt for '{model}'.")
-            return None, None
+from dbt_yamer.handlers.docblock import DEFAULT_MATCH_MEMO_PATH, DocBlockIndex, load_manifest, extract_doc_block_names
+from dbt_yamer.handlers.catalog import load_catalog
+from dbt_yamer.handlers.column_cache import DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL
+from dbt_yamer.handlers.generation_state import DEFAULT_STATE_PATH, GenerationState
+from dbt_yamer.handlers.schema_merge import round_trip_yaml
+from dbt_yamer.handlers.manifest_index import load_manifest_index
+from dbt_yamer.utils.dbt_runner import ENGINES, set_dbt_backend
+from dbt_yamer.utils.dbt_utils import expand_tag_selectors, get_model_sql_path
+from dbt_yamer.utils.scheduler import set_target_concurrency
+from dbt_yamer.utils.security_utils import SecurityError
+from dbt_yamer.exceptions import DbtYamerError, ManifestError
 
-        return dir_for_sql, raw_yaml_output
-
-    except subprocess.CalledProcessError as e:
-        click.echo(f"⚠️  Error generating YAML for '{model}':\n{e.stderr}")
-        return None, None
-    except Exception as e:
-        click.echo(f"⚠️  Unexpected error generating YAML for '{model}': {str(e)}")
-        return None, None
-
-def generate_md_for_model(model, project_dir):
+def generate_md_for_model(model, project_dir, manifest_index=None):
     """Helper function to generate markdown for a single model"""
     try:
-        ls_cmd = [
-            "dbt",
-            "--quiet",
-            "ls",
-            "--resource-types", "model",
-            "--select", model,
-            "--output", "path"
-        ]
-        
-        ls_result = subprocess.run(
-            ls_cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        paths = ls_result.stdout.strip().splitlines()
-        if not paths:
-            click.echo(f"⚠️  Warning: Could not find path for '{model}' (dbt ls returned no results).")
-            return False
-
-        sql_file_path = Path(paths[0])
-        dir_for_sql = sql_file_path.parent
+        sql_file_path = Path(get_model_sql_path(model, manifest_index=manifest_index))
+        dir_for_sql = project_dir / sql_file_path.parent
         
         create_md_file(model, dir_for_sql)
         click.echo(f"✅ Markdown documentation generated for '{model}'")
         return True
 
-    except subprocess.CalledProcessError as e:
-        click.echo(f"⚠️  Error generating markdown for '{model}':\n{e.stderr}")
+    except (DbtYamerError, SecurityError) as e:
+        click.echo(f"⚠️  Error generating markdown for '{model}': {e}")
         return False
     except Exception as e:
         click.echo(f"⚠️  Unexpected error generating markdown for '{model}': {str(e)}")
@@ -128,7 +55,90 @@ def generate_md_for_model(model, project_dir):
     default=None,
     help="Specify a target (e.g., uat) if the table already exists in a remote environment."
 )
-def generate_yamd(select, models, manifest, target):
+@click.option(
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of models introspected per dbt run-operation (1 disables batching)."
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default=None,
+    help="How dbt is executed: a subprocess per call, or in-process with the project parsed once. [default: $DBT_YAMER_ENGINE or subprocess]"
+)
+@click.option(
+    "--threads",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of model batches processed concurrently."
+)
+@click.option(
+    "--target-threads",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Maximum concurrent dbt run-operations against the target. [default: --threads]"
+)
+@click.option(
+    "--from-catalog",
+    is_flag=True,
+    help="Build YAML columns from catalog.json (written by `dbt docs generate`) without querying the warehouse."
+)
+@click.option(
+    "--catalog",
+    default="target/catalog.json",
+    show_default=True,
+    help="Path to the dbt catalog JSON file used with --from-catalog."
+)
+@click.option(
+    "--bulk-introspection",
+    is_flag=True,
+    help="Fetch each batch's columns with one information_schema query per schema instead of one metadata query per model."
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    show_default=True,
+    help=f"Reuse column lists stored in {DEFAULT_CACHE_PATH} for models whose SQL is unchanged."
+)
+@click.option(
+    "--cache-ttl",
+    default=DEFAULT_CACHE_TTL,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Seconds after which cached columns are re-introspected even if the model is unchanged."
+)
+@click.option(
+    "--match-cache/--no-match-cache",
+    default=False,
+    show_default=True,
+    help=f"Reuse fuzzy doc block matches stored in {DEFAULT_MATCH_MEMO_PATH} while the doc blocks are unchanged."
+)
+@click.option(
+    "--batch-match",
+    is_flag=True,
+    help="Fuzzy-match the unmatched columns of all models together in one similarity matrix on all cores. Files are written once every model is introspected."
+)
+@click.option(
+    "--upstream-descriptions",
+    is_flag=True,
+    help="Give columns without an exact doc block the description of the nearest upstream model or source that documents them."
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=f"Keep the file generated last time for models whose columns, types and doc blocks are unchanged, as recorded in {DEFAULT_STATE_PATH}. With --cache, unchanged models are not introspected either."
+)
+@click.option(
+    "--merge",
+    is_flag=True,
+    help="Update the columns of models that already have a properties file in place, leaving tests and descriptions alone, instead of writing a new file. Files are only rewritten if their columns change."
+)
+def generate_yamd(select, models, manifest, target, batch_size, engine, threads, target_threads, from_catalog, catalog,
+                  bulk_introspection, cache, cache_ttl, match_cache, batch_match,
+                  upstream_descriptions, incremental, merge):
     """
     Generate both YAML and markdown documentation for one or more dbt models.
 
@@ -136,6 +146,7 @@ def generate_yamd(select, models, manifest, target):
       dbt-yamer yamd -s dim_promotion dim_voucher
       dbt-yamer yamd --select tag:nightly
       dbt-yamer yamd -s dim_promotion tag:nightly -t uat
+      dbt-yamer yamd -s tag:nightly --from-catalog
     """
     if not select:
         click.echo("Please use --select/-s flag before specifying models.")
@@ -151,6 +162,15 @@ def generate_yamd(select, models, manifest, target):
             click.echo(f"Error: '+' selector is not supported: {model}")
             return
 
+    if merge:
+        try:
+            round_trip_yaml()
+        except DbtYamerError as e:
+            click.echo(f"Error: {e}")
+            return
+
+    set_dbt_backend(engine)
+
     try:
         project_dir = find_dbt_project_root()
     except FileNotFoundError as e:
@@ -160,90 +180,74 @@ def generate_yamd(select, models, manifest, target):
     # Track overall success
     yaml_success = []
     md_success = []
+    column_cache = None
+    state = None
 
-    # First, if we have a tag selector, get the list of models
-    processed_models = []
-    for model in models:
-        if model.startswith('tag:'):
-            click.echo(f"\nExpanding tag selector: {model}")
-            ls_cmd = [
-                "dbt",
-                "--quiet",
-                "ls",
-                "--select", model
-            ]
-            try:
-                ls_result = subprocess.run(
-                    ls_cmd,
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                # Split the fully qualified names and take the last part
-                tag_models = [
-                    path.split('.')[-1] 
-                    for path in ls_result.stdout.strip().splitlines()
-                ]
-                if not tag_models:
-                    click.echo(f"Warning: No models found for tag selector '{model}'")
-                    continue
-                processed_models.extend(tag_models)
-                click.echo(f"Found models for {model}: {', '.join(tag_models)}")
-            except subprocess.CalledProcessError as e:
-                click.echo(f"Error expanding tag selector '{model}':\n{e.stderr}")
-                continue
-        else:
-            processed_models.append(model)
+    manifest_index = load_manifest_index(project_dir / manifest, project_dir)
+    if manifest_index is None and upstream_descriptions:
+        click.echo("⚠️  Upstream descriptions need a current manifest; skipping them")
+    if manifest_index is None and merge:
+        click.echo("⚠️  Merging needs a current manifest; writing new files instead")
+    if manifest_index is not None:
+        doc_index = DocBlockIndex(manifest_index.doc_block_names)
+    else:
+        try:
+            doc_index = DocBlockIndex(extract_doc_block_names(load_manifest(manifest, ("docs",)).get("docs", {})))
+        except ManifestError as e:
+            click.echo(f"⚠️  {e}")
+            doc_index = None
+
+    # Expand tag selectors from the manifest (dbt ls only without one)
+    try:
+        processed_models = expand_tag_selectors(list(models), target, manifest_index)
+    except (DbtYamerError, SecurityError) as e:
+        click.echo(f"Error expanding selectors: {e}")
+        return
 
     if not processed_models:
         click.echo("No models found to process after expanding selectors.")
         return
 
     # First generate YAML files
-    click.echo("\n🔄 Generating YAML files...")
-    
-    manifest_data = load_manifest(manifest)
-    if not manifest_data:
+    if doc_index is None:
         click.echo("⚠️  Could not load manifest. Skipping YAML generation but will attempt markdown generation.")
     else:
-        with tempfile.TemporaryDirectory() as temp_macros_dir:
-            temp_macros_path = Path(temp_macros_dir) / "tmp_dbt_yammer_dbt_yamer_generate_yaml_macro.sql"
-            try:
-                with open(temp_macros_path, "w", encoding="utf-8") as f:
-                    f.write(generate_yaml_macro)
-            except OSError as e:
-                click.echo(f"⚠️  Failed to write temporary macros: {e}")
-                manifest_data = None
-
-            if manifest_data:
-                user_macros_dir = project_dir / "macros"
-                if not user_macros_dir.exists():
-                    user_macros_dir.mkdir(parents=True)
-
-                temp_macro_filename = "tmp_dbt_yammer_dbt_yamer_generate_yaml_macro.sql"
-                destination_macro_path = user_macros_dir / temp_macro_filename
-                
-                try:
-                    shutil.copy(temp_macros_path, destination_macro_path)
-                    
-                    for model in processed_models:
-                        dir_for_sql, raw_yaml_output = generate_yaml_for_model(model, target)
-                        if dir_for_sql and raw_yaml_output:
-                            yaml_success.append(model)
-                
-                finally:
-                    if destination_macro_path.exists():
-                        destination_macro_path.unlink()
+        set_target_concurrency(target, target_threads or threads)
+        column_cache = open_column_cache(project_dir, cache_ttl) if cache and not from_catalog else None
+        if match_cache:
+            doc_index.load_memo(str(project_dir / DEFAULT_MATCH_MEMO_PATH))
+        state = GenerationState(project_dir / DEFAULT_STATE_PATH) if incremental else None
+        try:
+            catalog_data = load_catalog(catalog) if from_catalog else None
+            yaml_success, _ = generate_model_yamls(
+                processed_models, target, doc_index, project_dir, manifest_index,
+                batch_size=batch_size, threads=threads, catalog=catalog_data,
+                bulk_introspection=bulk_introspection, cache=column_cache, batch_match=batch_match,
+                upstream_descriptions=upstream_descriptions, state=state, merge=merge
+            )
+        except DbtYamerError as e:
+            click.echo(f"⚠️  YAML generation failed: {e}")
+        finally:
+            if column_cache is not None:
+                column_cache.close()
+            if match_cache:
+                save_doc_match_memo(doc_index, project_dir)
+            if state is not None:
+                save_generation_state(state)
 
     # Then generate markdown files
     click.echo("\n🔄 Generating markdown documentation...")
     for model in processed_models:
-        if generate_md_for_model(model, project_dir):
+        if generate_md_for_model(model, project_dir, manifest_index):
             md_success.append(model)
 
     # Summary
     click.echo("\n📊 Generation Summary:")
+    if column_cache is not None:
+        click.echo(f"🗄️  Column cache: {column_cache.hits} hits, {column_cache.misses} misses")
+    if doc_index is not None:
+        report_doc_match_memo(doc_index)
+    report_generation_state(state)
     if yaml_success:
         click.echo(f"✅ YAML generated successfully for: {', '.join(yaml_success)}")
     else:
@@ -1,23 +1,107 @@
 import click
-import yaml
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-import tempfile
-import shutil
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import os
+import time
 
-from dbt_yamer.handlers.yaml_handlers import format_yaml
-from dbt_yamer.handlers.docblock import load_manifest, extract_doc_block_names, find_best_match
+from dbt_yamer.handlers.docblock import DEFAULT_MATCH_MEMO_PATH, DocBlockIndex, load_manifest, extract_doc_block_names
+from dbt_yamer.handlers.manifest_index import ManifestIndex, load_manifest_index
+from dbt_yamer.handlers.catalog import load_catalog, model_info_from_catalog
+from dbt_yamer.handlers.column_cache import ColumnCache, DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL
+from dbt_yamer.handlers.generation_state import DEFAULT_STATE_PATH, GenerationState, model_content_hash
+from dbt_yamer.handlers.schema_merge import merge_model_yaml, round_trip_yaml
 from dbt_yamer.macros.macro_content import generate_yaml_macro
-from dbt_yamer.handlers.file_handlers import get_unique_yaml_path, find_dbt_project_root, get_unique_temp_macro_path
-from dbt_yamer.utils.dbt_utils import expand_tag_selectors, get_model_sql_path, run_dbt_operation
-from dbt_yamer.utils.subprocess_utils import validate_dbt_available
+from dbt_yamer.handlers.file_handlers import OutputPlacer, find_dbt_project_root, get_unique_temp_macro_path
+from dbt_yamer.utils.dbt_utils import (
+    expand_tag_selectors, get_model_sql_path, run_dbt_operation, stream_dbt_operation,
+    batch_model_names, operation_timeout, parse_model_payload, split_models_yaml
+)
+from dbt_yamer.utils.dbt_runner import ENGINES, INPROCESS_ENGINE, get_dbt_backend, set_dbt_backend
+from dbt_yamer.utils.scheduler import ModelScheduler, even_batch_size, set_target_concurrency, target_slot
 from dbt_yamer.utils.security_utils import validate_manifest_path, sanitize_for_json
 from dbt_yamer.exceptions import (
     DbtYamerError, ValidationError, SubprocessError, 
     ManifestError, FileOperationError, DbtProjectError
 )
 
+# Number of models introspected per dbt run-operation. Every invocation pays
+# dbt's project parse, so batching amortises it across the whole chunk.
+DEFAULT_BATCH_SIZE = 50
+
+# The generation macro prints one compact JSON document per model, which is
+# parsed with json.loads and serialized to YAML once when the file is written.
+MACRO_OUTPUT_FORMAT = "json"
+
+# Batch result of a model collected for writing after batch matching
+_DEFERRED = ""
+
+# What happened to a model's YAML: a new file, an in-place merge or nothing
+_WRITTEN, _MERGED, _UNCHANGED = "written", "merged", "unchanged"
+
+# Generation macro kept installed by a long-running daemon. When set, commands
+# reuse it instead of writing (and forcing dbt to parse) a new temporary macro.
+_persistent_macro_path: Optional[Path] = None
+
+
+def use_persistent_macro(macro_path: Optional[Path]) -> None:
+    """
+    Register (or with None, unregister) an already installed generation macro.
+    
+    Args:
+        macro_path: Path of the installed macro file
+    """
+    global _persistent_macro_path
+    _persistent_macro_path = macro_path
+
+
+@contextmanager
+def generation_macro_installed(project_dir: Path) -> Iterator[Path]:
+    """
+    Make the generation macro available to dbt for the duration of the block.
+    
+    Writes a uniquely named temporary macro into the project's macros
+    directory and removes it afterwards, unless a persistent macro for this
+    project has been registered.
+    
+    Args:
+        project_dir: Path to dbt project root
+        
+    Yields:
+        Path of the macro file
+        
+    Raises:
+        FileOperationError: If the temporary macro cannot be created
+    """
+    user_macros_dir = project_dir / "macros"
+    persistent = _persistent_macro_path
+    if persistent is not None and persistent.parent == user_macros_dir and persistent.exists():
+        yield persistent
+        return
+    
+    # Generate unique temporary macro file
+    temp_macro_path, temp_filename = get_unique_temp_macro_path(user_macros_dir)
+    
+    try:
+        # Write temporary macro
+        try:
+            with open(temp_macro_path, "w", encoding="utf-8") as f:
+                f.write(generate_yaml_macro)
+        except OSError as e:
+            raise FileOperationError(f"Could not write temporary macro {temp_macro_path}: {e}")
+        
+        # A preloaded project does not know about the macro we just wrote
+        get_dbt_backend().invalidate()
+        
+        yield temp_macro_path
+    finally:
+        # Clean up temporary macro file
+        try:
+            if temp_macro_path.exists():
+                temp_macro_path.unlink()
+        except OSError as e:
+            click.echo(f"⚠️  Warning: Could not remove temporary macro file: {e}")
+
 
 @click.command(name="yaml")
 @click.option(
@@ -39,7 +123,90 @@ from dbt_yamer.exceptions import (
     default=None,
     help="Specify a target (e.g., uat) if the table already exists in a remote environment."
 )
-def generate_yaml(select, models, manifest, target):
+@click.option(
+    "--batch-size",
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of models introspected per dbt run-operation (1 disables batching)."
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default=None,
+    help="How dbt is executed: a subprocess per call, or in-process with the project parsed once. [default: $DBT_YAMER_ENGINE or subprocess]"
+)
+@click.option(
+    "--threads",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of model batches processed concurrently."
+)
+@click.option(
+    "--target-threads",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Maximum concurrent dbt run-operations against the target, to respect warehouse slot quotas. [default: --threads]"
+)
+@click.option(
+    "--from-catalog",
+    is_flag=True,
+    help="Build columns from catalog.json (written by `dbt docs generate`) without querying the warehouse."
+)
+@click.option(
+    "--catalog",
+    default="target/catalog.json",
+    show_default=True,
+    help="Path to the dbt catalog JSON file used with --from-catalog."
+)
+@click.option(
+    "--bulk-introspection",
+    is_flag=True,
+    help="Fetch each batch's columns with one information_schema query per schema instead of one metadata query per model."
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    show_default=True,
+    help=f"Reuse column lists stored in {DEFAULT_CACHE_PATH} for models whose SQL is unchanged."
+)
+@click.option(
+    "--cache-ttl",
+    default=DEFAULT_CACHE_TTL,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Seconds after which cached columns are re-introspected even if the model is unchanged."
+)
+@click.option(
+    "--match-cache/--no-match-cache",
+    default=False,
+    show_default=True,
+    help=f"Reuse fuzzy doc block matches stored in {DEFAULT_MATCH_MEMO_PATH} while the doc blocks are unchanged."
+)
+@click.option(
+    "--batch-match",
+    is_flag=True,
+    help="Fuzzy-match the unmatched columns of all models together in one similarity matrix on all cores. Files are written once every model is introspected."
+)
+@click.option(
+    "--upstream-descriptions",
+    is_flag=True,
+    help="Give columns without an exact doc block the description of the nearest upstream model or source that documents them."
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=f"Keep the file generated last time for models whose columns, types and doc blocks are unchanged, as recorded in {DEFAULT_STATE_PATH}. With --cache, unchanged models are not introspected either."
+)
+@click.option(
+    "--merge",
+    is_flag=True,
+    help="Update the columns of models that already have a properties file in place, leaving tests and descriptions alone, instead of writing a new file. Files are only rewritten if their columns change."
+)
+def generate_yaml(select, models, manifest, target, batch_size, engine, threads, target_threads, from_catalog, catalog,
+                  bulk_introspection, cache, cache_ttl, match_cache, batch_match,
+                  upstream_descriptions, incremental, merge):
     """
     Generate YAML schema files for one or more dbt models.
 
@@ -47,6 +214,10 @@ def generate_yaml(select, models, manifest, target):
       dbt-yamer yaml -s dim_promotion dim_voucher
       dbt-yamer yaml --select tag:nightly
       dbt-yamer yaml -s dim_promotion tag:nightly -t uat
+      dbt-yamer yaml -s tag:nightly --from-catalog
+      dbt-yamer yaml -s tag:nightly --cache
+      dbt-yamer yaml -s tag:nightly --incremental --cache
+      dbt-yamer yaml -s tag:nightly --merge
     """
     if not select:
         click.echo("❌ Please use --select/-s flag before specifying models.")
@@ -56,8 +227,17 @@ def generate_yaml(select, models, manifest, target):
         click.echo("❌ No models specified. Please provide at least one model name.")
         return
     
-    # Check if dbt is available
-    if not validate_dbt_available():
+    # Merging rewrites user-maintained files, which only ruamel.yaml does faithfully
+    if merge:
+        try:
+            round_trip_yaml()
+        except DbtYamerError as e:
+            click.echo(f"❌ {e}")
+            raise click.Abort()
+    
+    # Select the dbt execution engine and check that dbt is available
+    backend = set_dbt_backend(engine)
+    if not from_catalog and not backend.is_available():
         click.echo("❌ Error: dbt command not found. Please ensure dbt is installed and available in PATH.")
         raise click.Abort()
     
@@ -73,9 +253,29 @@ def generate_yaml(select, models, manifest, target):
         raise click.Abort()
     
     try:
+        # Validate manifest path
+        manifest_path = validate_manifest_path(manifest)
+        
+        # Load the compiled manifest index (doc blocks, tags and model paths)
+        click.echo(f"📖 Loading manifest from: {manifest_path}")
+        manifest_index = load_manifest_index(manifest_path, project_dir)
+        if manifest_index is not None:
+            doc_index = DocBlockIndex(manifest_index.doc_block_names)
+        else:
+            click.echo("⚠️  Manifest is older than dbt_project.yml; resolving models with dbt ls")
+            if upstream_descriptions:
+                click.echo("⚠️  Upstream descriptions need a current manifest; skipping them")
+            if merge:
+                click.echo("⚠️  Merging needs a current manifest; writing new files instead")
+            manifest_data = load_manifest(str(manifest_path), ("docs",))
+            doc_index = DocBlockIndex(extract_doc_block_names(manifest_data.get("docs", {})))
+        click.echo(f"📝 Found {len(doc_index)} doc blocks in manifest")
+        if match_cache:
+            doc_index.load_memo(str(project_dir / DEFAULT_MATCH_MEMO_PATH))
+        
         # Validate and expand selectors
         click.echo("🔍 Expanding model selectors...")
-        processed_models = expand_tag_selectors(list(models), target)
+        processed_models = expand_tag_selectors(list(models), target, manifest_index)
         
         if not processed_models:
             click.echo("❌ No models found after expanding selectors.")
@@ -83,62 +283,36 @@ def generate_yaml(select, models, manifest, target):
         
         click.echo(f"📋 Processing {len(processed_models)} models: {', '.join(processed_models)}")
         
-        # Validate manifest path
-        manifest_path = validate_manifest_path(manifest)
-        
-        # Load manifest
-        click.echo(f"📖 Loading manifest from: {manifest_path}")
-        manifest_data = load_manifest(str(manifest_path))
-        
-        docs = manifest_data.get("docs", {})
-        doc_block_names = extract_doc_block_names(docs)
-        click.echo(f"📝 Found {len(doc_block_names)} doc blocks in manifest")
-        
-        # Find dbt project root
-        project_dir = find_dbt_project_root()
-        user_macros_dir = project_dir / "macros"
+        catalog_data = None
+        if from_catalog:
+            click.echo(f"📚 Reading columns from catalog: {catalog}")
+            catalog_data = load_catalog(catalog)
         
-        # Generate unique temporary macro file
-        temp_macro_path, temp_filename = get_unique_temp_macro_path(user_macros_dir)
-        
-        # Track results
-        yaml_success = []
-        yaml_failures = []
+        column_cache = open_column_cache(project_dir, cache_ttl) if cache and not from_catalog else None
+        state = GenerationState(project_dir / DEFAULT_STATE_PATH) if incremental else None
         
+        set_target_concurrency(target, target_threads or threads)
         try:
-            # Write temporary macro
-            with open(temp_macro_path, "w", encoding="utf-8") as f:
-                f.write(generate_yaml_macro)
-            
-            click.echo("🔄 Generating YAML files...")
-            
-            # Process each model
-            for model in processed_models:
-                try:
-                    result = _process_single_model(
-                        model, target, manifest_data, doc_block_names, project_dir
-                    )
-                    if result:
-                        yaml_success.append(model)
-                        click.echo(f"✅ YAML generated for '{model}' → {result}")
-                    else:
-                        yaml_failures.append(model)
-                        
-                except DbtYamerError as e:
-                    click.echo(f"❌ Failed to process model '{model}': {e}")
-                    yaml_failures.append(model)
-                    continue
-                    
+            yaml_success, yaml_failures = generate_model_yamls(
+                processed_models, target, doc_index, project_dir, manifest_index,
+                batch_size=batch_size, threads=threads, catalog=catalog_data,
+                bulk_introspection=bulk_introspection, cache=column_cache, batch_match=batch_match,
+                upstream_descriptions=upstream_descriptions, state=state, merge=merge
+            )
         finally:
-            # Clean up temporary macro file
-            try:
-                if temp_macro_path.exists():
-                    temp_macro_path.unlink()
-            except OSError as e:
-                click.echo(f"⚠️  Warning: Could not remove temporary macro file: {e}")
+            if column_cache is not None:
+                column_cache.close()
+            if match_cache:
+                save_doc_match_memo(doc_index, project_dir)
+            if state is not None:
+                save_generation_state(state)
         
         # Summary
         click.echo("\\n📊 Generation Summary:")
+        if column_cache is not None:
+            click.echo(f"🗄️  Column cache: {column_cache.hits} hits, {column_cache.misses} misses")
+        report_doc_match_memo(doc_index)
+        report_generation_state(state)
         if yaml_success:
             click.echo(f"✅ YAML generated successfully for: {', '.join(yaml_success)}")
         
@@ -175,45 +349,422 @@ def generate_yaml(select, models, manifest, target):
             pass  # Ignore errors when restoring directory
 
 
-def _process_single_model(
-    model: str, 
-    target: str, 
-    manifest_data: dict, 
-    doc_block_names: List[str], 
-    project_dir: Path
-) -> str:
+def generate_model_yamls(
+    processed_models: List[str],
+    target: str,
+    doc_index: DocBlockIndex,
+    project_dir: Path,
+    manifest_index: ManifestIndex = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    threads: int = 1,
+    catalog: Optional[dict] = None,
+    bulk_introspection: bool = False,
+    cache: Optional[ColumnCache] = None,
+    batch_match: bool = False,
+    upstream_descriptions: bool = False,
+    state: Optional[GenerationState] = None,
+    merge: bool = False
+) -> Tuple[List[str], List[str]]:
     """
-    Process a single model to generate its YAML file.
+    Generate YAML files for models, installing the generation macro meanwhile.
+    
+    Models are split into batches that run on up to ``threads`` workers
+    (one with the in-process engine, whose dbt calls cannot overlap).
+    Output is reported batch by batch in selection order, and the temporary
+    macro is removed only after every worker has finished. With a catalog,
+    columns come from it and neither the macro nor dbt is used; with a cache,
+    only models without a fresh entry are introspected. With ``batch_match``,
+    files are written once every model is introspected, after the unmatched
+    column names of all models have been fuzzy-matched together. With
+    ``upstream_descriptions``, columns without an exact doc block take the
+    nearest upstream model's description before fuzzy matching is tried.
+    With ``state``, models whose entry is unchanged since the recorded run
+    keep their existing file instead of being written again. With ``merge``,
+    models that have a properties file get their columns updated in it.
     
     Args:
-        model: Model name to process
+        processed_models: Expanded model names
         target: Optional dbt target
-        manifest_data: Loaded manifest data
-        doc_block_names: List of available doc block names
+        doc_index: Index of the available doc blocks
         project_dir: Path to dbt project root
+        manifest_index: Optional index used to resolve SQL paths
+        batch_size: Maximum models per dbt run-operation
+        threads: Number of concurrent workers
+        catalog: Optional loaded catalog.json to read columns from
+        bulk_introspection: Read each batch's columns from information_schema
+        cache: Optional column cache consulted before and filled after dbt
+        batch_match: Fuzzy-match all models' columns in one batch before writing
+        upstream_descriptions: Inherit column descriptions through the manifest DAG
+        state: Optional record of previous runs used to skip unchanged models
+        merge: Update existing properties files in place instead of writing new ones
         
     Returns:
-        Path to generated YAML file or None if failed
+        Tuple of (models generated, models that failed)
         
     Raises:
-        DbtYamerError: If processing fails
+        FileOperationError: If the temporary macro cannot be created
     """
-    # Try to get SQL file path, fall back to default if it fails
+    # Track results
+    yaml_success = []
+    yaml_failures = []
+    
+    # Look every model up front so the macro is only installed if dbt must run
+    cached = {}
+    if cache is not None and catalog is None:
+        for model in processed_models:
+            model_info = cache.get(target, model, _cache_fingerprint(model, manifest_index, bulk_introspection))
+            if model_info is not None:
+                cached[model.lower()] = model_info
+    
+    needs_dbt = catalog is None and len(cached) < len(processed_models)
+    
+    # dbtRunner calls are serialised and capture the process-wide stdout, so
+    # extra workers would gain nothing and could lose messages to the capture
+    if needs_dbt and threads > 1 and get_dbt_backend().name == INPROCESS_ENGINE:
+        click.echo("ℹ️  The in-process engine runs one dbt command at a time; using a single thread")
+        threads = 1
+    
+    with generation_macro_installed(project_dir) if needs_dbt else nullcontext():
+        click.echo("🔄 Generating YAML files...")
+        
+        batches = batch_model_names(
+            processed_models, even_batch_size(len(processed_models), batch_size, threads)
+        )
+        
+        # Inline runs report as they go; workers collect messages for ordering
+        echo = click.echo if threads == 1 else None
+        deferred = [] if batch_match else None
+        placer = OutputPlacer()
+        
+        def process(batch):
+            return _process_batch(
+                batch, target, doc_index, project_dir, manifest_index, catalog, bulk_introspection,
+                cache, cached, echo, deferred, upstream_descriptions, placer, state, merge
+            )
+        
+        for batch, batch_output, error in ModelScheduler(threads).run(process, batches):
+            if error is not None:
+                for model in batch:
+                    click.echo(f"❌ Failed to process model '{model}': {error}")
+                    yaml_failures.append(model)
+                continue
+            
+            messages, results = batch_output
+            for message in messages:
+                click.echo(message)
+            for model, output_file in results:
+                if output_file == _DEFERRED:
+                    continue
+                if output_file:
+                    yaml_success.append(model)
+                else:
+                    yaml_failures.append(model)
+    
+    if deferred:
+        order = {model: position for position, model in enumerate(processed_models)}
+        deferred.sort(key=lambda item: order[item[0]])
+        
+        unmatched = []
+        for model, model_info in deferred:
+            upstream = _upstream_descriptions(model, manifest_index, upstream_descriptions)
+            unmatched += [
+                col["name"] for col in model_info.get("columns") or []
+                if col.get("name") and doc_index.exact_match(model, col["name"]) is None
+                and col["name"].lower() not in upstream
+            ]
+        start = time.perf_counter()
+        matched = doc_index.prime_fuzzy(unmatched)
+        click.echo(
+            f"🧮 Matched {matched} unique column names against {len(doc_index)} doc blocks "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        
+        for model, model_info in deferred:
+            output_file = _write_and_report(
+                model, model_info, target, doc_index, project_dir, manifest_index, click.echo,
+                upstream_descriptions, placer, state, merge
+            )
+            (yaml_success if output_file else yaml_failures).append(model)
+    
+    return yaml_success, yaml_failures
+
+
+def _process_batch(
+    batch: List[str],
+    target: str,
+    doc_index: DocBlockIndex,
+    project_dir: Path,
+    manifest_index: ManifestIndex = None,
+    catalog: Optional[dict] = None,
+    bulk_introspection: bool = False,
+    cache: Optional[ColumnCache] = None,
+    cached: Optional[Dict[str, dict]] = None,
+    echo: Optional[Callable[[str], None]] = None,
+    deferred: Optional[List[Tuple[str, dict]]] = None,
+    upstream_descriptions: bool = False,
+    placer: Optional[OutputPlacer] = None,
+    state: Optional[GenerationState] = None,
+    merge: bool = False
+) -> Tuple[List[str], List[Tuple[str, Optional[str]]]]:
+    """
+    Introspect and write one batch of models.
+    
+    On a worker thread messages are collected and returned for the caller to
+    print in order; with ``echo`` they are reported immediately instead.
+    Models of a batched dbt call are written as soon as dbt prints them,
+    unless a ``deferred`` list is given to collect them for writing later.
+    
+    Args:
+        batch: Model names in the batch
+        target: Optional dbt target
+        doc_index: Index of the available doc blocks
+        project_dir: Path to dbt project root
+        manifest_index: Optional index used to resolve SQL paths
+        catalog: Optional loaded catalog.json to read columns from
+        bulk_introspection: Read the batch's columns from information_schema
+        cache: Optional column cache to store freshly introspected models in
+        cached: Model entries already found in the cache, by lower-cased name
+        echo: Optional function to report messages with as they happen
+        deferred: Optional list that collects (model, model entry) instead of writing
+        upstream_descriptions: Inherit column descriptions through the manifest DAG
+        placer: Output placer shared by the run's workers
+        state: Optional record of previous runs used to skip unchanged models
+        merge: Update existing properties files in place instead of writing new ones
+        
+    Returns:
+        Tuple of (messages, [(model, output file or None), ...]); collected models get _DEFERRED
+    """
+    messages = []
+    results = {}
+    cached = cached or {}
+    report = echo or messages.append
+    
+    def write(model, model_info):
+        if deferred is not None:
+            deferred.append((model, model_info))
+            results[model] = _DEFERRED
+        else:
+            results[model] = _write_and_report(
+                model, model_info, target, doc_index, project_dir, manifest_index, report,
+                upstream_descriptions, placer, state, merge
+            )
+    
+    def introspected(model, model_info):
+        if cache is not None:
+            cache.put(target, model, _cache_fingerprint(model, manifest_index, bulk_introspection), model_info)
+        write(model, model_info)
+    
+    to_fetch = []
+    for model in batch:
+        if catalog is not None:
+            try:
+                write(model, model_info_from_catalog(model, catalog, manifest_index))
+            except DbtYamerError as e:
+                report(f"❌ Failed to process model '{model}': {e}")
+                results[model] = None
+        elif model.lower() in cached:
+            write(model, cached[model.lower()])
+        else:
+            to_fetch.append(model)
+    
+    # Write each model as soon as dbt has printed it, while it introspects the rest
+    remaining = to_fetch
+    if len(to_fetch) > 1:
+        pending = {model.lower(): model for model in to_fetch}
+        with target_slot(target):
+            try:
+                for model_name, model_info in _stream_batch_model_info(to_fetch, target, bulk_introspection):
+                    model = pending.pop(model_name, None)
+                    if model is not None:
+                        introspected(model, model_info)
+            except DbtYamerError as e:
+                report(f"⚠️  Batch of {len(to_fetch)} models failed, falling back to single-model calls: {e}")
+        remaining = [model for model in to_fetch if model.lower() in pending]
+    
+    for model in remaining:
+        if len(to_fetch) > 1:
+            report(f"🔁 Retrying '{model}' on its own")
+        try:
+            with target_slot(target):
+                model_info = _fetch_model_info(model, target)
+        except DbtYamerError as e:
+            report(f"❌ Failed to process model '{model}': {e}")
+            results[model] = None
+            continue
+        introspected(model, model_info)
+    
+    return messages, [(model, results[model]) for model in batch]
+
+
+def _write_and_report(
+    model: str,
+    model_info: dict,
+    target: str,
+    doc_index: DocBlockIndex,
+    project_dir: Path,
+    manifest_index: Optional[ManifestIndex],
+    report: Callable[[str], None],
+    upstream_descriptions: bool = False,
+    placer: Optional[OutputPlacer] = None,
+    state: Optional[GenerationState] = None,
+    merge: bool = False
+) -> Optional[str]:
+    """Write one model's YAML file and report the outcome; return the path or None."""
     try:
-        sql_file_path = get_model_sql_path(model, target)
-        sql_path = Path(sql_file_path)
-        dir_for_sql = sql_path.parent
-    except Exception:
-        # Fallback: use models directory as default
-        dir_for_sql = project_dir / "models"
-        click.echo(f"⚠️  Using default models directory for '{model}'")
+        result, outcome = _place_model_yaml(
+            model, model_info, target, doc_index, project_dir, manifest_index,
+            echo=report, upstream_descriptions=upstream_descriptions, placer=placer, state=state, merge=merge
+        )
+    except DbtYamerError as e:
+        report(f"❌ Failed to process model '{model}': {e}")
+        return None
+    if outcome == _WRITTEN:
+        report(f"✅ YAML generated for '{model}' → {result}")
+    elif outcome == _MERGED:
+        report(f"🔀 Columns of '{model}' merged into {result}")
+    else:
+        report(f"⏭️  YAML unchanged for '{model}' → {result}")
+    return result
+
+
+def open_column_cache(project_dir: Path, ttl: int = DEFAULT_CACHE_TTL) -> Optional[ColumnCache]:
+    """
+    Open the project's column cache, continuing without one if that fails.
     
-    # If dir_for_sql is relative, make it relative to project_dir
-    if not dir_for_sql.is_absolute():
-        dir_for_sql = project_dir / dir_for_sql
+    Args:
+        project_dir: Path to dbt project root
+        ttl: Maximum entry age in seconds
+        
+    Returns:
+        The opened cache, or None if it is unavailable
+    """
+    try:
+        return ColumnCache(project_dir / DEFAULT_CACHE_PATH, ttl)
+    except FileOperationError as e:
+        click.echo(f"⚠️  {e}; continuing without the column cache")
+        return None
+
+
+def save_doc_match_memo(doc_index: DocBlockIndex, project_dir: Path) -> None:
+    """
+    Persist the run's fuzzy doc block matches, warning if that fails.
+    
+    Args:
+        doc_index: Doc block index used for the run
+        project_dir: Path to dbt project root
+    """
+    try:
+        doc_index.save_memo(str(project_dir / DEFAULT_MATCH_MEMO_PATH))
+    except OSError as e:
+        click.echo(f"⚠️  Could not save doc block matches: {e}")
+
+
+def save_generation_state(state: GenerationState) -> None:
+    """
+    Persist the run's generation state, warning if that fails.
+    
+    Args:
+        state: Generation state used for the run
+    """
+    try:
+        state.save()
+    except OSError as e:
+        click.echo(f"⚠️  Could not save generation state: {e}")
+
+
+def report_generation_state(state: Optional[GenerationState]) -> None:
+    """
+    Print how many models were generated, changed and skipped incrementally.
+    
+    Args:
+        state: Generation state used for the run, None if not incremental
+    """
+    if state is not None:
+        click.echo(
+            f"🧾 Incremental: {state.generated} generated, {state.changed} changed, "
+            f"{state.skipped} skipped (unchanged)"
+        )
+
+
+def report_doc_match_memo(doc_index: DocBlockIndex) -> None:
+    """
+    Print how often fuzzy doc block matches were served from the memo.
     
+    Args:
+        doc_index: Doc block index used for the run
+    """
+    lookups = doc_index.memo_hits + doc_index.memo_misses
+    if lookups:
+        click.echo(
+            f"🧠 Doc block matches: {doc_index.memo_hits} memo hits, {doc_index.memo_misses} misses "
+            f"({doc_index.memo_hits / lookups:.0%} hit rate)"
+        )
+
+
+def _cache_fingerprint(model: str, manifest_index: Optional[ManifestIndex], bulk_introspection: bool) -> str:
+    # Without a manifest checksum only the TTL expires an entry. Bulk mode
+    # yields different columns (no nested fields), so it gets its own entries.
+    checksum = manifest_index.get_checksum(model) if manifest_index is not None else None
+    return f"{checksum or ''}:{'bulk' if bulk_introspection else 'adapter'}"
+
+
+def _stream_batch_model_info(
+    batch: List[str],
+    target: str,
+    bulk_introspection: bool = False
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Introspect several models with a single dbt run-operation, streaming results.
+    
+    Payloads that cannot be parsed are skipped; the caller retries every
+    model that was not yielded with a single-model invocation.
+    
+    Args:
+        batch: Model names to introspect together
+        target: Optional dbt target
+        bulk_introspection: Query information_schema once per schema rather
+            than the adapter once per relation
+        
+    Yields:
+        Tuples of (lower-cased model name, model entry) in the order dbt
+        prints them
+        
+    Raises:
+        DbtYamerError: If the dbt invocation fails
+    """
+    args_dict = {
+        "model_names": [sanitize_for_json(model) for model in batch],
+        "output_format": MACRO_OUTPUT_FORMAT
+    }
+    if bulk_introspection:
+        args_dict["bulk_introspection"] = True
+    
+    payloads = stream_dbt_operation(
+        "dbt_yamer_generate_contract_yaml", args_dict, target,
+        timeout=operation_timeout(len(batch))
+    )
+    for model_name, payload in payloads:
+        model_info = parse_model_payload(payload)
+        if model_info is not None:
+            yield model_name, model_info
+
+
+def _fetch_model_info(model: str, target: str) -> dict:
+    """
+    Introspect a single model with its own dbt run-operation.
+    
+    Args:
+        model: Model name to process
+        target: Optional dbt target
+        
+    Returns:
+        The model entry produced by the generation macro
+        
+    Raises:
+        DbtYamerError: If dbt fails or returns unusable output
+    """
     # Build arguments for dbt macro
-    args_dict = {"model_names": [sanitize_for_json(model)]}
+    args_dict = {"model_names": [sanitize_for_json(model)], "output_format": MACRO_OUTPUT_FORMAT}
     
     # Run dbt operation to get YAML
     raw_yaml_output = run_dbt_operation("dbt_yamer_generate_contract_yaml", args_dict, target)
@@ -221,70 +772,148 @@ def _process_single_model(
     if not raw_yaml_output:
         raise ValidationError(f"No YAML output returned by dbt for '{model}'")
     
-    # Parse YAML
-    try:
-        parsed = yaml.safe_load(raw_yaml_output)
-    except yaml.YAMLError as e:
-        raise ValidationError(f"Failed to parse dbt's YAML output for '{model}': {e}")
-    
-    if not parsed or "models" not in parsed:
-        raise ValidationError(f"Invalid YAML structure for '{model}' - missing 'models' key")
-    
-    all_models = parsed["models"]
+    all_models = split_models_yaml(raw_yaml_output)
     if not all_models:
         raise ValidationError(f"No models found in YAML for '{model}'")
     
-    model_info = all_models[0]
+    return all_models.get(model.lower()) or next(iter(all_models.values()))
+
+
+def _place_model_yaml(
+    model: str,
+    model_info: dict,
+    target: str,
+    doc_index: DocBlockIndex,
+    project_dir: Path,
+    manifest_index: ManifestIndex = None,
+    echo: Callable[[str], None] = click.echo,
+    upstream_descriptions: bool = False,
+    placer: Optional[OutputPlacer] = None,
+    state: Optional[GenerationState] = None,
+    merge: bool = False
+) -> Tuple[str, str]:
+    """
+    Apply doc blocks to an introspected model and write its YAML file unless unchanged.
+    
+    The content hash is taken after doc blocks are applied and before the
+    entry is formatted, so an unchanged model costs neither formatting nor
+    any file system writes. With ``merge``, a model that already has a
+    properties file gets its columns updated in that file instead, which is
+    only rewritten if they differ; other models get a new file.
+    
+    Args:
+        model: Model name to process
+        model_info: Model entry produced by the generation macro
+        target: Optional dbt target
+        doc_index: Index of the available doc blocks
+        project_dir: Path to dbt project root
+        manifest_index: Optional index used to resolve the model's SQL path
+        echo: Function used to report warnings
+        upstream_descriptions: Inherit column descriptions through the manifest DAG
+        placer: Output placer shared by the run (a fresh one if not given)
+        state: Optional record of previous runs used to skip unchanged models
+        merge: Update an existing properties file in place instead of writing a new one
+        
+    Returns:
+        Tuple of (path to the YAML file, _WRITTEN, _MERGED or _UNCHANGED)
+        
+    Raises:
+        DbtYamerError: If writing fails
+    """
     columns = model_info.get("columns")
     
     # Handle None columns case
     if columns is None:
-        click.echo(f"⚠️  Warning: Model '{model}' has no column information. Ensure you've run `dbt run --select {model}` with the correct target.")
+        echo(f"⚠️  Warning: Model '{model}' has no column information. Ensure you've run `dbt run --select {model}` with the correct target.")
         columns = []
     elif not columns:
-        click.echo(f"⚠️  Warning: Model '{model}' has 0 columns. Ensure you've run `dbt run --select {model}`")
+        echo(f"⚠️  Warning: Model '{model}' has 0 columns. Ensure you've run `dbt run --select {model}`")
     
     # Apply doc blocks to columns only if we have columns
     if columns:
-        _apply_doc_blocks_to_columns(columns, model, doc_block_names)
+        _apply_doc_blocks_to_columns(
+            columns, model, doc_index, _upstream_descriptions(model, manifest_index, upstream_descriptions)
+        )
     
     # Ensure model_info has columns key set (even if empty)
     model_info["columns"] = columns
     
-    # Generate unique file path
-    output_file, versioned_name = get_unique_yaml_path(dir_for_sql, model)
+    content_hash = None
+    if state is not None:
+        content_hash = model_content_hash(model_info)
+        existing = state.unchanged_output(target, model, content_hash)
+        if existing is not None:
+            state.record(target, model, content_hash, existing, skipped=True)
+            return existing, _UNCHANGED
     
-    # Update model name in YAML
-    model_info["name"] = versioned_name
+    patch_path = manifest_index.get_patch_path(model) if merge and manifest_index is not None else None
+    if patch_path is not None:
+        properties_file = project_dir / patch_path
+        merged = merge_model_yaml(properties_file, model, columns)
+        if merged is not None:
+            if state is not None:
+                state.record(target, model, content_hash, str(properties_file), skipped=not merged)
+            return str(properties_file), _MERGED if merged else _UNCHANGED
+        echo(f"⚠️  '{model}' is not described in {patch_path}; writing a new file")
     
-    # Create final YAML structure
-    version_val = parsed.get("version", 2)
-    single_model_yaml = {
-        "version": version_val,
-        "models": [model_info]
-    }
+    # Try to get SQL file path, fall back to default if it fails
+    try:
+        sql_file_path = get_model_sql_path(model, target, manifest_index)
+        sql_path = Path(sql_file_path)
+        dir_for_sql = sql_path.parent
+    except Exception:
+        # Fallback: use models directory as default
+        dir_for_sql = project_dir / "models"
+        echo(f"⚠️  Using default models directory for '{model}'")
+    
+    # If dir_for_sql is relative, make it relative to project_dir
+    if not dir_for_sql.is_absolute():
+        dir_for_sql = project_dir / dir_for_sql
     
-    # Format and write YAML
-    raw_single_yaml = yaml.dump(single_model_yaml, sort_keys=False, allow_unicode=True)
-    formatted_yaml = format_yaml(raw_single_yaml)
+    from dbt_yamer.handlers.yaml_handlers import format_yaml_data
     
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(formatted_yaml)
-    except OSError as e:
-        raise FileOperationError(f"Could not write YAML file {output_file}: {e}")
+    def render(versioned_name):
+        # Update model name in YAML and format the final structure
+        model_info["name"] = versioned_name
+        return format_yaml_data({"version": 2, "models": [model_info]})
     
-    return str(output_file)
+    # Write atomically under the first free name
+    output_file, _ = (placer or OutputPlacer()).write(dir_for_sql, model, render)
+    
+    if state is not None:
+        state.record(target, model, content_hash, str(output_file))
+    
+    return str(output_file), _WRITTEN
+
+
+def _upstream_descriptions(
+    model: str,
+    manifest_index: Optional[ManifestIndex],
+    enabled: bool
+) -> Dict[str, str]:
+    # Inheritance needs the manifest DAG; without an index there is nothing to inherit
+    if not enabled or manifest_index is None:
+        return {}
+    return manifest_index.upstream_descriptions(model)
 
 
-def _apply_doc_blocks_to_columns(columns: List[dict], model: str, doc_block_names: List[str]) -> None:
+def _apply_doc_blocks_to_columns(
+    columns: List[dict],
+    model: str,
+    doc_index: DocBlockIndex,
+    upstream: Optional[Dict[str, str]] = None
+) -> None:
     """
     Apply doc blocks to column descriptions.
     
+    Exact doc blocks come first, then descriptions inherited from upstream
+    models, then fuzzy matches.
+    
     Args:
         columns: List of column dictionaries to modify
         model: Model name for doc block matching
-        doc_block_names: Available doc block names
+        doc_index: Index of the available doc blocks
+        upstream: Optional inherited descriptions by lower-cased column name
     """
     if not columns:
         return
@@ -294,28 +923,20 @@ def _apply_doc_blocks_to_columns(columns: List[dict], model: str, doc_block_name
         if not col_name:
             continue
         
-        # Try exact column doc block match first
-        col_doc_name = f"col_{model}_{col_name}"
-        if col_doc_name in doc_block_names:
-            col["description"] = f'{{{{ doc("{col_doc_name}") }}}}'
-            continue
-        
-        # Try model-specific column match
-        model_col_doc = f"{model}_{col_name}"
-        if model_col_doc in doc_block_names:
-            col["description"] = f'{{{{ doc("{model_col_doc}") }}}}'
+        # Exact col_{model}_{col}, {model}_{col} and col_{col} blocks
+        doc_name = doc_index.exact_match(model, col_name)
+        if doc_name:
+            col["description"] = f'{{{{ doc("{doc_name}") }}}}'
             continue
         
-        # Try generic column match
-        generic_col_doc = f"col_{col_name}"
-        if generic_col_doc in doc_block_names:
-            col["description"] = f'{{{{ doc("{generic_col_doc}") }}}}'
+        # Nearest upstream model documenting the same column
+        if upstream and col_name.lower() in upstream:
+            col["description"] = upstream[col_name.lower()]
             continue
         
-        # Try fuzzy matching
-        best_match = find_best_match(col_name, doc_block_names)
-        if best_match:
-            col["description"] = f'{{{{ doc("{best_match}") }}}}'
+        doc_name = doc_index.fuzzy_match(col_name)
+        if doc_name:
+            col["description"] = f'{{{{ doc("{doc_name}") }}}}'
         else:
             # Set empty description if no match found
             col.setdefault("description", "")
\ No newline at end of file
@@ -1,10 +1,60 @@
+import importlib
+import sys
+
 import click
-from dbt_yamer.cli.run import run
-from dbt_yamer.cli.generate_yaml import generate_yaml
-from dbt_yamer.cli.generate_markdown import generate_markdown
-from dbt_yamer.cli.generate_yamd import generate_yamd
 
-@click.group()
+
+class LazyGroup(click.Group):
+    """
+    Click group that imports a subcommand's module only when it is needed.
+
+    Subcommands are registered as ``name -> "module:attribute"`` so that
+    ``dbt-yamer run`` does not pay for loading the YAML/markdown machinery.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+class DaemonAwareGroup(LazyGroup):
+    """
+    Click group that hands generation commands to a running daemon.
+
+    Without a daemon for the current project the command runs locally.
+    """
+
+    def main(self, args=None, prog_name=None, complete_var=None, standalone_mode=True, **extra):
+        args = list(sys.argv[1:] if args is None else args)
+        from dbt_yamer.utils.daemon import forward_to_daemon
+        exit_code = forward_to_daemon(args)
+        if exit_code is not None:
+            if standalone_mode:
+                sys.exit(exit_code)
+            return exit_code
+        return super().main(args, prog_name, complete_var, standalone_mode, **extra)
+
+
+@click.group(
+    cls=DaemonAwareGroup,
+    lazy_subcommands={
+        "run": "dbt_yamer.cli.run:run",
+        "yaml": "dbt_yamer.cli.generate_yaml:generate_yaml",
+        "md": "dbt_yamer.cli.generate_markdown:generate_markdown",
+        "yamd": "dbt_yamer.cli.generate_yamd:generate_yamd",
+        "daemon": "dbt_yamer.cli.daemon:daemon",
+    },
+)
 def cli():
     """
     dbt-yamer CLI
@@ -14,13 +64,9 @@ def cli():
       - Generate YAML configs (with contract enforcement)
       - Generate markdown documentation
       - Generate both YAML and markdown together
+      - Keep a warm daemon for fast repeated calls
     """
     pass
 
-cli.add_command(run)
-cli.add_command(generate_yaml)
-cli.add_command(generate_markdown)
-cli.add_command(generate_yamd)
-
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,83 @@
+"""
+Model YAML built from dbt's catalog.json instead of a live warehouse.
+"""
+import json
+from typing import Dict, List, Optional
+
+from dbt_yamer.exceptions import ManifestError, ValidationError
+from dbt_yamer.handlers.manifest_index import ManifestIndex
+from dbt_yamer.handlers.model_entry import column_entry, model_entry
+
+
+def load_catalog(catalog_path: str) -> Dict:
+    """
+    Loads the catalog written by ``dbt docs generate``.
+
+    Args:
+        catalog_path: Path to catalog.json
+
+    Returns:
+        The loaded catalog as a dictionary
+
+    Raises:
+        ManifestError: If the catalog cannot be loaded or parsed
+    """
+    if not catalog_path:
+        raise ManifestError("Catalog path cannot be empty")
+
+    try:
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise ManifestError(f"Catalog file not found: {catalog_path}. Run `dbt docs generate` first.")
+    except json.JSONDecodeError as e:
+        raise ManifestError(f"Failed to parse catalog JSON: {e}")
+    except (OSError, PermissionError) as e:
+        raise ManifestError(f"Error reading catalog file: {e}")
+
+
+def _find_catalog_node(model: str, catalog: dict, manifest_index: Optional[ManifestIndex]) -> Optional[dict]:
+    nodes = catalog.get("nodes", {})
+
+    if manifest_index is not None:
+        unique_id = manifest_index.get_unique_id(model)
+        if unique_id in nodes:
+            return nodes[unique_id]
+
+    # Without a usable manifest, match the model part of the unique_id
+    suffix = f".{model.lower()}"
+    for unique_id, node in nodes.items():
+        if unique_id.startswith("model.") and unique_id.lower().endswith(suffix):
+            return node
+    return None
+
+
+def model_info_from_catalog(model: str, catalog: dict, manifest_index: Optional[ManifestIndex] = None) -> dict:
+    """
+    Build the model entry the generation macro would produce, from the catalog.
+
+    Args:
+        model: Model name
+        catalog: Loaded catalog.json
+        manifest_index: Optional index used to find the model's unique_id
+
+    Returns:
+        Model entry with name, contract config and columns
+
+    Raises:
+        ValidationError: If the model is not in the catalog
+    """
+    node = _find_catalog_node(model, catalog, manifest_index)
+    if node is None:
+        raise ValidationError(f"Model '{model}' not found in catalog. Run `dbt docs generate` to refresh it.")
+
+    catalog_columns: List[dict] = sorted(
+        node.get("columns", {}).values(),
+        key=lambda column: column.get("index") or 0
+    )
+
+    return model_entry(model, [
+        column_entry(column["name"], column.get("type") or "")
+        for column in catalog_columns
+        if column.get("name")
+    ])
@@ -0,0 +1,141 @@
+"""
+Persistent cache of the column lists returned by the generation macro.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from dbt_yamer.exceptions import FileOperationError
+
+# Where the cache lives, relative to the dbt project root
+DEFAULT_CACHE_PATH = "target/dbt_yamer_cache.sqlite"
+
+# Entries older than this are refreshed even if the model is unchanged
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_columns (
+    target TEXT NOT NULL,
+    model TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    model_info TEXT NOT NULL,
+    PRIMARY KEY (target, model)
+)
+"""
+
+
+class ColumnCache:
+    """
+    SQLite cache of model entries keyed by dbt target and model name.
+
+    An entry is fresh while its fingerprint (derived from the manifest node
+    checksum) matches and it is younger than the TTL. The cache is shared by
+    worker threads; lookups that fail for any reason count as misses so a
+    broken cache never stops generation.
+    """
+
+    def __init__(self, path: Path, ttl: int = DEFAULT_CACHE_TTL):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path of the SQLite file
+            ttl: Maximum entry age in seconds
+
+        Raises:
+            FileOperationError: If the database cannot be opened
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        import sqlite3
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.execute(_SCHEMA)
+            self._connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            raise FileOperationError(f"Could not open column cache {self.path}: {e}")
+
+    def get(self, target: Optional[str], model: str, fingerprint: str) -> Optional[dict]:
+        """
+        Return the cached model entry if it is still fresh.
+
+        Args:
+            target: dbt target name (None for the default target)
+            model: Model name
+            fingerprint: Current fingerprint of the model
+
+        Returns:
+            A fresh copy of the cached model entry, or None on a miss
+        """
+        import sqlite3
+
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT fingerprint, stored_at, model_info FROM model_columns WHERE target = ? AND model = ?",
+                    (target or "", model.lower())
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+
+            if row is None or row[0] != fingerprint or time.time() - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            try:
+                model_info = json.loads(row[2])
+            except ValueError:
+                self.misses += 1
+                return None
+
+            # Entries stored before the relation was built are never fresh
+            if not isinstance(model_info, dict) or not model_info.get("columns"):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return model_info
+
+    def put(self, target: Optional[str], model: str, fingerprint: str, model_info: dict) -> None:
+        """
+        Store a model entry, replacing any previous one.
+
+        Entries without columns are not stored: the relation has usually not
+        been built yet, and building it does not change the SQL checksum the
+        fingerprint is derived from.
+
+        Args:
+            target: dbt target name (None for the default target)
+            model: Model name
+            fingerprint: Current fingerprint of the model
+            model_info: Model entry as returned by the generation macro
+        """
+        import sqlite3
+
+        if not model_info.get("columns"):
+            return
+
+        payload = json.dumps(model_info)
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO model_columns VALUES (?, ?, ?, ?, ?)",
+                    (target or "", model.lower(), fingerprint, time.time(), payload)
+                )
+                self._connection.commit()
+            except sqlite3.Error:
+                pass  # Caching is best effort
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -1,18 +1,139 @@
 import json
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Optional
-from fuzzywuzzy import fuzz
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 from dbt_yamer.exceptions import ManifestError
 
+# Manifests already loaded by this process, keyed by resolved path and reused
+# while the file's size and mtime are unchanged. A long-running daemon relies
+# on this to avoid re-reading the manifest on every request.
+_manifest_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], Tuple[Tuple[int, int], Dict]] = {}
+_manifest_cache_lock = threading.Lock()
 
-def load_manifest(manifest_path: str) -> Dict:
+# Top-level manifest keys used to generate YAML: doc blocks, and the nodes,
+# sources and project name behind the manifest index.
+GENERATION_SECTIONS = ("metadata", "nodes", "sources", "docs")
+
+# Set to stream manifest sections with ijson: far less memory, but several
+# times slower than parsing the whole file with orjson.
+LOW_MEMORY_ENV = "DBT_YAMER_LOW_MEMORY"
+
+
+def clear_manifest_cache() -> None:
+    """Forget every manifest loaded by this process."""
+    with _manifest_cache_lock:
+        _manifest_cache.clear()
+
+
+def _manifest_backends():
+    """Names of the JSON backends installed, fastest first."""
+    backends = []
+    for module_name in ("orjson", "ijson"):
+        try:
+            __import__(module_name)
+            backends.append(module_name)
+        except ImportError:
+            pass
+    return backends + ["json"]
+
+
+def _stream_sections(f, sections: FrozenSet[str]) -> Dict:
+    import ijson
+    
+    # Only the requested top-level values are built; the rest of the file is
+    # tokenized and dropped, and parsing stops once every section was found.
+    result = {}
+    depth = 0
+    key = None
+    builder = None
+    for _, event, value in ijson.parse(f, use_float=True):
+        if depth == 1 and event == "map_key":
+            key = value
+            builder = ijson.ObjectBuilder() if key in sections else None
+            continue
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if builder is not None:
+            builder.event(event, value)
+            if depth == 1:
+                result[key] = builder.value
+                builder = None
+                if len(result) == len(sections):
+                    break
+    return result
+
+
+def read_manifest(manifest_path: str, sections: Optional[Iterable[str]] = None, backend: Optional[str] = None) -> Dict:
+    """
+    Reads a manifest file without caching, using the best available backend.
+    
+    orjson (when installed) or the standard library parses the whole file
+    and the requested sections are picked from it. With ``sections`` and
+    ``DBT_YAMER_LOW_MEMORY`` set, ijson (when installed) streams the file and
+    builds only those top-level keys instead, which keeps memory
+    proportional to what is used at the cost of speed.
+    
+    Args:
+        manifest_path: Path to the manifest file
+        sections: Top-level keys to load, or None for the whole manifest
+        backend: Force ``ijson``, ``orjson`` or ``json`` (for benchmarking)
+        
+    Returns:
+        The manifest, or the requested sections of it
+        
+    Raises:
+        ManifestError: If the manifest cannot be parsed
+        OSError: If the file cannot be read
+    """
+    available = _manifest_backends()
+    if backend is None:
+        low_memory = sections is not None and os.environ.get(LOW_MEMORY_ENV) and "ijson" in available
+        backend = "ijson" if low_memory else next(name for name in available if name != "ijson")
+    elif backend not in available:
+        raise ManifestError(f"JSON backend '{backend}' is not installed")
+    
+    wanted = frozenset(sections) if sections is not None else None
+    
+    if backend == "ijson":
+        import ijson
+        with open(manifest_path, "rb") as f:
+            try:
+                if wanted is None:
+                    return next(ijson.items(f, "", use_float=True))
+                return _stream_sections(f, wanted)
+            except ijson.JSONError as e:
+                raise ManifestError(f"Failed to parse manifest JSON: {e}")
+    
+    with open(manifest_path, "rb") as f:
+        try:
+            if backend == "orjson":
+                import orjson
+                manifest = orjson.loads(f.read())
+            else:
+                manifest = json.load(f)
+        except ValueError as e:
+            raise ManifestError(f"Failed to parse manifest JSON: {e}")
+    
+    if wanted is None:
+        return manifest
+    return {key: value for key, value in manifest.items() if key in wanted}
+
+
+def load_manifest(manifest_path: str, sections: Optional[Iterable[str]] = None) -> Dict:
     """
     Loads the dbt manifest JSON file and returns it as a Python dictionary.
     
+    The result is cached per process until the file changes on disk, so
+    callers must not modify the returned dictionary. Passing ``sections``
+    loads only those top-level keys (see ``read_manifest``), which is much
+    cheaper on large projects.
+    
     Args:
         manifest_path: Path to the manifest file
+        sections: Top-level keys to load, or None for the whole manifest
         
     Returns:
         The loaded manifest as a dictionary
@@ -22,14 +143,29 @@ def load_manifest(manifest_path: str) -> Dict:
     """
     if not manifest_path:
         raise ManifestError("Manifest path cannot be empty")
+    
+    wanted = tuple(sorted(set(sections))) if sections is not None else None
         
     try:
-        with open(manifest_path, "r", encoding='utf-8') as f:
-            return json.load(f)
+        path = os.path.realpath(manifest_path)
+        stat = os.stat(path)
+        fingerprint = (stat.st_size, stat.st_mtime_ns)
+        
+        with _manifest_cache_lock:
+            cached = _manifest_cache.get((path, wanted))
+            full = _manifest_cache.get((path, None))
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        if wanted is not None and full is not None and full[0] == fingerprint:
+            return {key: value for key, value in full[1].items() if key in wanted}
+        
+        manifest = read_manifest(manifest_path, wanted)
+        
+        with _manifest_cache_lock:
+            _manifest_cache[(path, wanted)] = (fingerprint, manifest)
+        return manifest
     except FileNotFoundError:
         raise ManifestError(f"Manifest file not found: {manifest_path}")
-    except json.JSONDecodeError as e:
-        raise ManifestError(f"Failed to parse manifest JSON: {e}")
     except (OSError, PermissionError) as e:
         raise ManifestError(f"Error reading manifest file: {e}")
 
@@ -44,6 +180,108 @@ def extract_doc_block_names(docs: dict) -> list:
     return [doc_info["name"] for key, doc_info in docs.items() if key.startswith("doc.")]
 
 
+# Fuzzy matches must score above this (fuzz.ratio, rounded to an integer)
+MATCH_THRESHOLD = 80
+
+
+class FuzzyMatcher:
+    """
+    Finds the doc block name closest to a column name.
+
+    Gives the same answer as scoring every name with ``fuzz.ratio`` on
+    lower-cased strings and keeping the first name with the highest score
+    above MATCH_THRESHOLD, but names are lower-cased once and candidates are
+    pruned by length: the ratio of strings of lengths a and b is at most
+    200 * min(a, b) / (a + b). When rapidfuzz is installed the remaining
+    candidates are scored in C with a score cutoff.
+    """
+
+    def __init__(self, doc_block_names: Iterable[str]):
+        self.names = list(doc_block_names)
+        self._by_length: Dict[int, List[Tuple[int, str]]] = {}
+        for position, name in enumerate(self.names):
+            lowered = name.lower()
+            self._by_length.setdefault(len(lowered), []).append((position, lowered))
+        # Candidate pools per target length, in doc_block_names order
+        self._pools: Dict[int, Tuple[List[int], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def candidates_for_length(self, length: int) -> Tuple[List[int], List[str]]:
+        """
+        Return the doc block names that can score above the threshold against
+        a name of the given length.
+
+        Args:
+            length: Length of the column name to match
+
+        Returns:
+            Tuple of (positions in doc_block_names, lower-cased names), in
+            doc_block_names order
+        """
+        with self._lock:
+            pool = self._pools.get(length)
+        if pool is not None:
+            return pool
+
+        candidates = sorted(
+            candidate
+            for other, names in self._by_length.items()
+            if 200 * min(length, other) > MATCH_THRESHOLD * (length + other)
+            for candidate in names
+        )
+        pool = ([position for position, _ in candidates], [lowered for _, lowered in candidates])
+        with self._lock:
+            self._pools[length] = pool
+        return pool
+
+    def best_match(self, target_name: str) -> Optional[str]:
+        """
+        Return the best matching doc block name.
+
+        Args:
+            target_name: Column name to match
+
+        Returns:
+            The doc block name, or None if nothing scores above the threshold
+        """
+        target = target_name.lower()
+        positions, candidates = self.candidates_for_length(len(target))
+        if not candidates:
+            return None
+
+        try:
+            from rapidfuzz import fuzz, process
+        except ImportError:
+            from fuzzywuzzy import fuzz
+
+            best_index, best_ratio = None, 0
+            for index, candidate in enumerate(candidates):
+                ratio = fuzz.ratio(target, candidate)
+                if ratio > best_ratio:
+                    best_index, best_ratio = index, ratio
+        else:
+            # fuzzywuzzy rounds the same score to an integer; ties go to the
+            # name listed first
+            best_index, best_ratio = None, 0
+            for _, score, index in process.extract(
+                target, candidates, scorer=fuzz.ratio, processor=None, score_cutoff=MATCH_THRESHOLD,
+                limit=None
+            ):
+                ratio = int(round(score))
+                if ratio > best_ratio or (ratio == best_ratio and index < best_index):
+                    best_index, best_ratio = index, ratio
+
+        if best_index is None or best_ratio <= MATCH_THRESHOLD:
+            return None
+        return self.names[positions[best_index]] or None
+
+
+# The matcher built for the most recent doc block list, reused while callers
+# keep passing the same list object
+_last_matcher: Optional[Tuple[list, int, FuzzyMatcher]] = None
+_last_matcher_lock = threading.Lock()
+
+
 def find_best_match(target_name: str, doc_block_names: list) -> Optional[str]:
     """
     Uses fuzzy string matching to find the best match for a column name in the doc block names.
@@ -55,36 +293,268 @@ def find_best_match(target_name: str, doc_block_names: list) -> Optional[str]:
     Returns:
         str | None: The name of the best matching doc block or None if no good match found.
     """
-    best_match = None
-    best_ratio = 0.0
-    
-    for doc_name in doc_block_names:
-        ratio = fuzz.ratio(target_name.lower(), doc_name.lower())
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_match = doc_name
-    
-    # Return best match only if it's above 80% confidence
-    if best_match and (best_ratio > 80):
-        return best_match
-    
-    return None
+    global _last_matcher
+
+    with _last_matcher_lock:
+        cached = _last_matcher
+        if cached is not None and cached[0] is doc_block_names and cached[1] == len(doc_block_names):
+            matcher = cached[2]
+        else:
+            matcher = FuzzyMatcher(doc_block_names)
+            _last_matcher = (doc_block_names, len(doc_block_names), matcher)
+
+    return matcher.best_match(target_name)
+
+
+# Fuzzy matches persisted between runs, relative to the dbt project root
+DEFAULT_MATCH_MEMO_PATH = "target/dbt_yamer_doc_matches.json"
+
+# Similarity matrix cells scored per cdist call (float32, so ~32 MB)
+_CDIST_CELLS = 8_000_000
+
+
+class DocBlockIndex:
+    """
+    Doc block names indexed for the tiered column lookup.
+
+    The exact tiers (``col_{model}_{column}``, ``{model}_{column}`` and
+    ``col_{column}``) are set lookups, and the fuzzy fallback is a
+    FuzzyMatcher built on first use. Build one per run and share it between
+    models and worker threads.
+
+    Fuzzy results are memoized by lower-cased column name, which is all the
+    matcher looks at, so a column name shared by many models is matched once.
+    The memo can be saved and reloaded across runs; it is tied to the
+    fingerprint of the doc block set and ignored once that changes.
+    """
+
+    def __init__(self, doc_block_names: Iterable[str]):
+        self.names = list(doc_block_names)
+        self._names = frozenset(self.names)
+        self._matcher: Optional[FuzzyMatcher] = None
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Optional[str]] = {}
+        self._memo_dirty = False
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-1 of the doc block names, independent of their order."""
+        import hashlib
+
+        return hashlib.sha1("\n".join(sorted(self._names)).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, doc_name: str) -> bool:
+        return doc_name in self._names
+
+    def exact_match(self, model: str, column_name: str) -> Optional[str]:
+        """
+        Return the doc block named after the column, most specific first.
+
+        Args:
+            model: Model name
+            column_name: Column name
+
+        Returns:
+            The doc block name or None if no tier matches
+        """
+        for doc_name in (f"col_{model}_{column_name}", f"{model}_{column_name}", f"col_{column_name}"):
+            if doc_name in self._names:
+                return doc_name
+        return None
+
+    def fuzzy_match(self, column_name: str) -> Optional[str]:
+        """
+        Return the closest doc block name, as find_best_match does.
+
+        Args:
+            column_name: Column name
+
+        Returns:
+            The doc block name or None if nothing is close enough
+        """
+        key = column_name.lower()
+        with self._lock:
+            if key in self._memo:
+                self.memo_hits += 1
+                return self._memo[key]
+            self.memo_misses += 1
+            if self._matcher is None:
+                self._matcher = FuzzyMatcher(self.names)
+
+        doc_name = self._matcher.best_match(column_name)
+        with self._lock:
+            self._memo[key] = doc_name
+            self._memo_dirty = True
+        return doc_name
+
+    def prime_fuzzy(self, column_names: Iterable[str]) -> int:
+        """
+        Fuzzy-match many column names at once and memoize the results.
+
+        New names are grouped by length and each group is scored against its
+        length-pruned doc block names in one similarity matrix, computed on all
+        cores with rapidfuzz's ``cdist`` in row chunks that bound memory. The
+        few scores that reach the threshold are then re-scored exactly and
+        tie-broken as in FuzzyMatcher, so later fuzzy_match calls return what
+        they would have computed themselves.
+        Without NumPy the names are matched one by one.
+
+        Args:
+            column_names: Column names to match
+
+        Returns:
+            Number of names that were not memoized yet
+        """
+        with self._lock:
+            keys = [key for key in dict.fromkeys(name.lower() for name in column_names) if key not in self._memo]
+            if self._matcher is None:
+                self._matcher = FuzzyMatcher(self.names)
+        if not keys:
+            return 0
+
+        try:
+            import numpy as np
+            from rapidfuzz import fuzz, process
+        except ImportError:
+            matches = {key: self._matcher.best_match(key) for key in keys}
+        else:
+            matches = dict.fromkeys(keys)
+            by_length: Dict[int, List[str]] = {}
+            for key in keys:
+                by_length.setdefault(len(key), []).append(key)
+
+            # One matrix per name length, against the length-pruned candidates
+            for length, group in by_length.items():
+                positions, candidates = self._matcher.candidates_for_length(length)
+                if not candidates:
+                    continue
+                rows_per_chunk = max(1, _CDIST_CELLS // len(candidates))
+                for start in range(0, len(group), rows_per_chunk):
+                    chunk = group[start:start + rows_per_chunk]
+                    scores = process.cdist(
+                        chunk, candidates, scorer=fuzz.ratio, processor=None, score_cutoff=MATCH_THRESHOLD,
+                        workers=-1
+                    )
+                    for row, key in enumerate(chunk):
+                        best_index, best_ratio = None, 0
+                        # Candidates are in list order, so ties go to the name listed first
+                        for index in np.flatnonzero(scores[row]):
+                            ratio = int(round(fuzz.ratio(key, candidates[index])))
+                            if ratio > best_ratio:
+                                best_index, best_ratio = index, ratio
+                        if best_index is not None and best_ratio > MATCH_THRESHOLD:
+                            matches[key] = self.names[positions[best_index]] or None
+
+        with self._lock:
+            self._memo.update(matches)
+            self._memo_dirty = True
+        return len(keys)
 
+    def load_memo(self, path: str) -> int:
+        """
+        Load fuzzy matches saved by an earlier run for the same doc blocks.
+
+        A missing, unreadable or outdated file is ignored.
+
+        Args:
+            path: Path of the memo file
+
+        Returns:
+            Number of matches loaded
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        if not isinstance(saved, dict) or saved.get("fingerprint") != self.fingerprint \
+                or not isinstance(saved.get("matches"), dict):
+            return 0
+
+        with self._lock:
+            for key, doc_name in saved["matches"].items():
+                if doc_name is None or doc_name in self._names:
+                    self._memo.setdefault(key, doc_name)
+        return len(saved["matches"])
+
+    def save_memo(self, path: str) -> None:
+        """
+        Save the memoized fuzzy matches if this run added any.
+
+        Args:
+            path: Path of the memo file
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        with self._lock:
+            if not self._memo_dirty:
+                return
+            matches = dict(self._memo)
+            self._memo_dirty = False
+
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".dbt_yamer_doc_matches.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "matches": matches}, f)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
 
-def apply_doc_blocks(model_yaml: dict, manifest_data: dict) -> dict:
+    def match_column(self, model: str, column_name: str) -> Optional[str]:
+        """
+        Return the doc block for a column: exact tiers first, then fuzzy.
+
+        Args:
+            model: Model name
+            column_name: Column name
+
+        Returns:
+            The doc block name or None if nothing matches
+        """
+        return self.exact_match(model, column_name) or self.fuzzy_match(column_name)
+
+
+def apply_doc_blocks(model_yaml: dict, manifest_data: dict, doc_index: Optional[DocBlockIndex] = None) -> dict:
     """
     Apply doc blocks to model YAML. Leave description empty if no good match is found.
+
+    Args:
+        model_yaml: Model entry whose columns are updated in place
+        manifest_data: Manifest with a ``docs`` section
+        doc_index: Index of the manifest's doc blocks, built if not given
+
+    Returns:
+        The updated model entry
     """
-    doc_block_names = extract_doc_block_names(manifest_data)
+    docs = manifest_data.get('docs', {})
+    block_contents = {
+        doc_info['name']: doc_info.get('block_contents', '')
+        for key, doc_info in docs.items() if key.startswith('doc.')
+    }
+    if doc_index is None:
+        doc_index = DocBlockIndex(block_contents)
     
     # If the model has columns defined
     if 'columns' in model_yaml:
         for column in model_yaml['columns']:
             column_name = column['name']
-            best_match = find_best_match(column_name, doc_block_names)
+            best_match = doc_index.match_column(model_yaml.get('name', ''), column_name)
             
-            if best_match and best_match in manifest_data['docs']:
-                column['description'] = manifest_data['docs'][best_match]['block_contents']
+            if best_match and best_match in block_contents:
+                column['description'] = block_contents[best_match]
             else:
                 column['description'] = ''
     
@@ -106,7 +576,7 @@ def main():
 
     try:
         print(f"Loading manifest from: {manifest_path}")
-        manifest = load_manifest(manifest_path)
+        manifest = load_manifest(manifest_path, sections=("docs",))
 
         docs = manifest.get("docs", {})
         if not docs:
@@ -135,11 +605,179 @@ def main():
         return 1
 
 
+# Directories that hold build output or installed packages, not project YAML
+_SKIPPED_DIRS = frozenset({"target", "dbt_packages", "dbt_modules", "logs"})
+
+# Resource types whose schema YAML entries carry columns
+_COLUMN_RESOURCES = ("models", "seeds", "snapshots")
+
+_DOC_REFERENCE = re.compile(r'\{\{\s*doc\(\s*["\']([^"\']+)["\']\s*\)\s*\}\}')
+
+# How long extract_column_doc answers from an index before checking the files again
+_COLUMN_DOC_REFRESH_SECONDS = 2.0
+
+
+def _column_doc_references(data) -> List[Tuple[str, str, str]]:
+    """Return (resource, column, doc block) for every doc() column description in a schema file."""
+    references = []
+    if not isinstance(data, dict):
+        return references
+
+    entries = []
+    for resource_type in _COLUMN_RESOURCES:
+        entries += [(entry.get("name"), entry) for entry in data.get(resource_type) or [] if isinstance(entry, dict)]
+    for source in data.get("sources") or []:
+        if isinstance(source, dict):
+            entries += [
+                (f"{source.get('name')}.{table.get('name')}", table)
+                for table in source.get("tables") or [] if isinstance(table, dict)
+            ]
+
+    for resource, entry in entries:
+        for column in entry.get("columns") or []:
+            if not isinstance(column, dict) or not column.get("name"):
+                continue
+            match = _DOC_REFERENCE.search(str(column.get("description") or ""))
+            if match:
+                references.append((str(resource), str(column["name"]), match.group(1)))
+    return references
+
+
+class ColumnDocIndex:
+    """
+    Column name → doc block references found in a project's schema YAML.
+
+    Every ``.yml``/``.yaml`` file under the directory (at any depth, skipping
+    build output and installed packages) is parsed once. Each column whose
+    description references a doc block is recorded with the resource it
+    belongs to. ``refresh`` re-parses only files whose mtime or size changed,
+    and queries are answered from memory.
+    """
+
+    def __init__(self, directory_path: str):
+        self.directory_path = directory_path
+        # path -> ((size, mtime_ns), [(resource, column, doc block), ...])
+        self._files: Dict[str, Tuple[Tuple[int, int], List[Tuple[str, str, str]]]] = {}
+        self._by_column: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._lock = threading.Lock()
+        self.refreshed_at = 0.0
+        self.refresh()
+
+    def _yaml_files(self) -> List[str]:
+        paths = []
+        for root, dirs, files in os.walk(self.directory_path):
+            dirs[:] = sorted(d for d in dirs if d not in _SKIPPED_DIRS and not d.startswith("."))
+            paths += [os.path.join(root, file) for file in sorted(files) if file.endswith((".yml", ".yaml"))]
+        return paths
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            Number of files that were (re-)parsed
+        """
+        import time
+        import yaml
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        files = {}
+        parsed = 0
+        for path in self._yaml_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            known = self._files.get(path)
+            if known is not None and known[0] == signature:
+                files[path] = known
+                continue
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    references = _column_doc_references(yaml.load(f, Loader=loader))
+            except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+                print(f"Error processing file {path}: {e}")
+                references = []
+            files[path] = (signature, references)
+            parsed += 1
+
+        by_column: Dict[str, List[Tuple[str, str, str]]] = {}
+        for path, (_, references) in files.items():
+            for resource, column, doc_name in references:
+                by_column.setdefault(column, []).append((resource, doc_name, path))
+
+        with self._lock:
+            self._files = files
+            self._by_column = by_column
+            self.refreshed_at = time.monotonic()
+        return parsed
+
+    def references(self, column_name: str) -> List[Tuple[str, str, str]]:
+        """
+        Return every documented use of a column.
+
+        Args:
+            column_name: Column name, matched exactly
+
+        Returns:
+            List of (resource name, doc block name, YAML path) in file order
+        """
+        with self._lock:
+            return list(self._by_column.get(column_name, []))
+
+    def find(self, column_name: str) -> Optional[str]:
+        """
+        Return the doc block of the first documented use of a column.
+
+        Args:
+            column_name: Column name, matched exactly
+
+        Returns:
+            The doc block name, or None if the column is never documented with one
+        """
+        with self._lock:
+            references = self._by_column.get(column_name)
+        return references[0][1] if references else None
+
+
+# Indexes built by extract_column_doc, by resolved directory
+_column_doc_indexes: Dict[str, ColumnDocIndex] = {}
+_column_doc_indexes_lock = threading.Lock()
+
+
+def get_column_doc_index(directory_path: str) -> ColumnDocIndex:
+    """
+    Return the shared column doc index of a directory, refreshing it if due.
+
+    Args:
+        directory_path: Directory containing schema YAML files
+
+    Returns:
+        The directory's ColumnDocIndex
+    """
+    import time
+
+    key = os.path.realpath(directory_path)
+    with _column_doc_indexes_lock:
+        index = _column_doc_indexes.get(key)
+        if index is None:
+            index = _column_doc_indexes[key] = ColumnDocIndex(directory_path)
+            return index
+    if time.monotonic() - index.refreshed_at > _COLUMN_DOC_REFRESH_SECONDS:
+        index.refresh()
+    return index
+
+
 def extract_column_doc(directory_path, column_name):
     """
     Extracts the doc block associated with a specific column name from YAML files in a directory.
     Searches for column definitions and their associated doc blocks.
 
+    The directory's schema files are parsed once into a ColumnDocIndex that
+    is reused (and refreshed for changed files) by later calls.
+
     Args:
         directory_path (str): Path to the directory containing YAML files.
         column_name (str): Name of the column to search for.
@@ -149,71 +787,12 @@ def extract_column_doc(directory_path, column_name):
     """
     if not column_name or not directory_path:
         return None
-        
-    # Patterns for matching column and doc blocks
-    column_pattern = re.compile(rf'^\s*-?\s*name:\s*["\']?{re.escape(column_name)}["\']?\s*$', re.MULTILINE)
-    doc_pattern = re.compile(r'\{\{\s*doc\(["\']([^"\']+)["\']\)\s*\}\}')
-    
-    yaml_files = []
-    try:
-        # Limit depth to avoid deep recursion
-        for root, dirs, files in os.walk(directory_path):
-            # Limit depth to 3 levels to avoid performance issues
-            level = root.replace(directory_path, '').count(os.sep)
-            if level >= 3:
-                dirs[:] = []  # Don't descend further
-                continue
-            
-            for file in files:
-                if file.endswith((".yml", ".yaml")):
-                    yaml_files.append(os.path.join(root, file))
-    except (OSError, PermissionError) as e:
-        print(f"Error accessing directory {directory_path}: {e}")
-        return None
 
-    def search_column_in_file(yaml_file_path):
-        """
-        Search for the specific column and its associated doc block.
-        """
-        try:
-            with open(yaml_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Find column definition
-                column_match = column_pattern.search(content)
-                if not column_match:
-                    return None
-                
-                # Get the position of the column match
-                column_pos = column_match.start()
-                
-                # Look for the next few hundred characters after the column definition
-                # to find the description with doc block
-                search_window = content[column_pos:column_pos + 1000]
-                
-                # Find the doc block in the description
-                doc_match = doc_pattern.search(search_window)
-                if doc_match:
-                    return doc_match.group(1)
-                    
-        except (OSError, UnicodeDecodeError, PermissionError) as e:
-            print(f"Error processing file {yaml_file_path}: {e}")
-        except Exception as e:
-            print(f"Unexpected error processing file {yaml_file_path}: {e}")
+    if not os.path.isdir(directory_path):
+        print(f"Error accessing directory {directory_path}: not a directory")
         return None
 
-    # Use ThreadPoolExecutor with limited workers to avoid resource exhaustion
-    with ThreadPoolExecutor(max_workers=min(4, len(yaml_files) if yaml_files else 1)) as executor:
-        try:
-            results = executor.map(search_column_in_file, yaml_files)
-            
-            for result in results:
-                if result is not None:
-                    return result
-        except Exception as e:
-            print(f"Error in parallel processing: {e}")
-
-    return None
+    return get_column_doc_index(directory_path).find(column_name)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import os
 import tempfile
+import threading
 import uuid
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Dict, Iterator, Set, Tuple
 from dbt_yamer.exceptions import FileOperationError
 
+# Versioned names tried before falling back to a random suffix
+MAX_YAML_VERSIONS = 1000
+
 
 def get_unique_yaml_path(dir_path: Path, base_name: str) -> Tuple[Path, str]:
     """
@@ -38,7 +42,7 @@ def get_unique_yaml_path(dir_path: Path, base_name: str) -> Tuple[Path, str]:
         return candidate, base_name
 
     # Try versioned names with a reasonable limit
-    max_versions = 1000  # Prevent infinite loops
+    max_versions = MAX_YAML_VERSIONS  # Prevent infinite loops
     version_num = 1
     
     while version_num <= max_versions:
@@ -55,6 +59,125 @@ def get_unique_yaml_path(dir_path: Path, base_name: str) -> Tuple[Path, str]:
     return candidate, versioned_name
 
 
+def _yaml_name_candidates(base_name: str) -> Iterator[str]:
+    yield base_name
+    for version_num in range(1, MAX_YAML_VERSIONS + 1):
+        yield f"{base_name}_v{version_num}"
+    yield f"{base_name}_{str(uuid.uuid4())[:8]}"
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it, which affects every thread;
+    # done once at import, before any worker threads create files
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp creates 0600 files; published files get what open() would give
+_DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+class OutputPlacer:
+    """
+    Places generated YAML files under free ``name.yml`` / ``name_vN.yml`` names.
+
+    Each directory is listed once. The names found there and those handed
+    out since are kept in memory behind a lock, so concurrent workers never
+    pick the same name and no per-candidate ``exists()`` calls are made.
+    Files are written to a hidden temporary file in the same directory and
+    published with ``os.link``, which fails rather than overwrite a file
+    another process created meanwhile; where hard links are unsupported
+    ``os.replace`` is used. Either way a file appears complete or not at all,
+    so a concurrent ``dbt parse`` never reads a partial file.
+
+    Create one per run: names freed on disk later are not noticed.
+    """
+
+    def __init__(self):
+        self._taken: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._file_mode = _DEFAULT_FILE_MODE
+
+    def _taken_names(self, dir_path: Path) -> Set[str]:
+        key = os.path.abspath(str(dir_path))
+        taken = self._taken.get(key)
+        if taken is None:
+            try:
+                dir_path.mkdir(parents=True, exist_ok=True)
+                taken = set(os.listdir(key))
+            except (OSError, PermissionError) as e:
+                raise FileOperationError(f"Cannot create directory {dir_path}: {e}")
+            self._taken[key] = taken
+        return taken
+
+    def reserve(self, dir_path: Path, base_name: str) -> Tuple[Path, str]:
+        """
+        Reserve a free YAML file name, as get_unique_yaml_path would pick it.
+
+        Args:
+            dir_path: Directory to create the file in
+            base_name: Base name for the file
+
+        Returns:
+            Tuple of (Path, str) for the reserved file path and versioned name
+
+        Raises:
+            FileOperationError: If the directory cannot be created or listed
+        """
+        if not dir_path or not base_name:
+            raise FileOperationError("Directory path and base name cannot be empty")
+
+        with self._lock:
+            taken = self._taken_names(dir_path)
+            for versioned_name in _yaml_name_candidates(base_name):
+                if f"{versioned_name}.yml" not in taken:
+                    taken.add(f"{versioned_name}.yml")
+                    return dir_path / f"{versioned_name}.yml", versioned_name
+        raise FileOperationError(f"Could not find a free file name for {base_name} in {dir_path}")
+
+    def _publish(self, path: Path, content: str) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.chmod(temp_path, self._file_mode)
+            try:
+                os.link(temp_path, str(path))
+            except FileExistsError:
+                raise
+            except OSError:
+                os.replace(temp_path, str(path))
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def write(self, dir_path: Path, base_name: str, render: Callable[[str], str]) -> Tuple[Path, str]:
+        """
+        Write a new YAML file under the first free name.
+
+        Args:
+            dir_path: Directory to create the file in
+            base_name: Base name for the file
+            render: Function returning the file content for the chosen versioned name
+
+        Returns:
+            Tuple of (Path, str) for the written file and its versioned name
+
+        Raises:
+            FileOperationError: If the file cannot be written
+        """
+        while True:
+            path, versioned_name = self.reserve(dir_path, base_name)
+            try:
+                self._publish(path, render(versioned_name))
+            except FileExistsError:
+                continue  # Created by another process since the listing; the name stays taken
+            except OSError as e:
+                raise FileOperationError(f"Could not write YAML file {path}: {e}")
+            return path, versioned_name
+
+
 def find_dbt_project_root() -> Path:
     """
     Find the dbt project root by looking for dbt_project.yml in current and parent directories.
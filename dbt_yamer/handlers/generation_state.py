@@ -0,0 +1,146 @@
+"""
+State of previous generation runs, used to skip models whose output would not change.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# Where the state lives, relative to the dbt project root
+DEFAULT_STATE_PATH = "target/dbt_yamer_state.json"
+
+# Bump whenever the recorded hashes change meaning so old state is ignored
+_STATE_FORMAT = 1
+
+
+def model_content_hash(model_info: dict) -> str:
+    """
+    Hash a model entry as it would be written: columns, types and descriptions.
+
+    Args:
+        model_info: Model entry after doc blocks have been applied
+
+    Returns:
+        Hex digest that changes whenever the written YAML would
+    """
+    payload = json.dumps(model_info, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationState:
+    """
+    Per-model record of the last YAML file generated for each dbt target.
+
+    Each entry holds the content hash of the written model entry and the
+    path of the file. A model is unchanged when its new content hash matches
+    and that file still exists. Outcomes are counted as generated (first
+    time), changed (new content) or skipped.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load the state file; a missing, unreadable or outdated one starts empty.
+
+        Args:
+            path: Path of the JSON state file
+        """
+        self.path = Path(path)
+        self.generated = 0
+        self.changed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._models = {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(saved, dict) and saved.get("format") == _STATE_FORMAT and isinstance(saved.get("models"), dict):
+            self._models = saved["models"]
+
+    @staticmethod
+    def _key(target: Optional[str], model: str) -> str:
+        return f"{target or ''}|{model.lower()}"
+
+    def unchanged_output(self, target: Optional[str], model: str, content_hash: str) -> Optional[str]:
+        """
+        Return the previously written file if the model's content is unchanged.
+
+        Args:
+            target: dbt target name (None for the default target)
+            model: Model name
+            content_hash: Hash of the model entry about to be written
+
+        Returns:
+            Path of the existing file, or None if the model must be written
+        """
+        with self._lock:
+            entry = self._models.get(self._key(target, model))
+        if entry and entry.get("content") == content_hash and os.path.isfile(entry.get("path", "")):
+            return entry["path"]
+        return None
+
+    def record(
+        self,
+        target: Optional[str],
+        model: str,
+        content_hash: str,
+        path: str,
+        skipped: bool = False
+    ) -> None:
+        """
+        Record a model's outcome and count it.
+
+        Args:
+            target: dbt target name (None for the default target)
+            model: Model name
+            content_hash: Hash of the model entry
+            path: File holding the model's YAML
+            skipped: Whether the existing file was kept instead of writing one
+        """
+        key = self._key(target, model)
+        with self._lock:
+            previous = self._models.get(key)
+            if skipped:
+                self.skipped += 1
+            elif previous is None:
+                self.generated += 1
+            else:
+                self.changed += 1
+            self._models[key] = {
+                "content": content_hash,
+                "path": os.path.abspath(path),
+                "recorded_at": time.time(),
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the state file if anything was recorded.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"format": _STATE_FORMAT, "models": dict(self._models)}
+            self._dirty = False
+
+        import tempfile
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".dbt_yamer_state.", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
@@ -0,0 +1,469 @@
+"""
+Indexes built once from a dbt manifest and persisted next to it.
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dbt_yamer.exceptions import ManifestError
+
+# Compiled index written next to manifest.json (i.e. under target/)
+INDEX_SIDECAR_NAME = "dbt_yamer_index.marshal"
+
+# Bump whenever the index layout changes so old sidecars are rebuilt
+_SIDECAR_FORMAT = 3
+
+# Indexes built by this process, keyed by manifest path and project directory
+# and reused while the manifest's size and mtime are unchanged.
+_index_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], "ManifestIndex"]] = {}
+_index_cache_lock = threading.Lock()
+
+
+class ManifestIndex:
+    """
+    Lookup tables over the model nodes of a dbt manifest.
+
+    Models are addressable by plain name, by ``package.name`` and, for
+    versioned models, by ``name.v<version>``. A plain name resolves to the root
+    project's model before a package's, and to the latest version of a
+    versioned model.
+
+    Tags are indexed from both ``tags`` and ``config.tags``; models sharing a
+    tag are listed in unique_id order, which is the order dbt ls prints them in.
+
+    The index also carries the doc block names, the upstream nodes of every
+    model and snapshot, the documented columns of every node and source, and
+    the properties file of every root-project model, so commands that only
+    need those never load the manifest itself.
+    Inherited column descriptions are resolved lazily, once per node.
+    """
+
+    # Attributes persisted in the sidecar file
+    _STATE = (
+        "project_name", "doc_block_names", "_paths", "_unique_ids", "_checksums", "_tags", "_upstream",
+        "_column_descriptions", "_patch_paths",
+    )
+
+    def __init__(self, manifest_data: dict, project_dir: Optional[Path] = None):
+        self.project_name = manifest_data.get("metadata", {}).get("project_name")
+        self.project_dir = Path(project_dir) if project_dir else None
+        self.doc_block_names: List[str] = [
+            doc_info["name"] for key, doc_info in manifest_data.get("docs", {}).items() if key.startswith("doc.")
+        ]
+        self._paths: Dict[str, str] = {}
+        self._unique_ids: Dict[str, str] = {}
+        self._checksums: Dict[str, str] = {}
+        self._tags: Dict[str, Dict[str, None]] = {}
+        self._upstream: Dict[str, List[str]] = {}
+        self._column_descriptions: Dict[str, Dict[str, str]] = {}
+        self._patch_paths: Dict[str, str] = {}
+        self._init_inherited()
+
+        nodes = dict(manifest_data.get("sources", {}))
+        nodes.update(manifest_data.get("nodes", {}))
+        for unique_id, node in nodes.items():
+            self._add_columns(unique_id, node)
+            if node.get("resource_type") == "snapshot":
+                self._upstream[unique_id] = list((node.get("depends_on") or {}).get("nodes") or [])
+
+        models = [
+            (unique_id, node) for unique_id, node in manifest_data.get("nodes", {}).items()
+            if node.get("resource_type") == "model"
+        ]
+
+        for unique_id, node in sorted(models, key=lambda item: item[0]):
+            self._add_tags(node)
+            self._upstream[unique_id] = list((node.get("depends_on") or {}).get("nodes") or [])
+
+        # Root-project models and latest versions are added last so they win
+        for unique_id, node in sorted(models, key=lambda item: self._precedence(item[1])):
+            self._add_model(unique_id, node)
+
+    @classmethod
+    def from_state(cls, state: dict, project_dir: Optional[Path] = None) -> "ManifestIndex":
+        """
+        Rebuild an index from the state saved by ``to_state``.
+
+        Args:
+            state: Persisted attributes, e.g. read from the sidecar file
+            project_dir: dbt project root
+
+        Returns:
+            ManifestIndex equal to the one the state was taken from
+        """
+        index = cls.__new__(cls)
+        for name in cls._STATE:
+            setattr(index, name, state[name])
+        index.project_dir = Path(project_dir) if project_dir else None
+        index._init_inherited()
+        return index
+
+    def _init_inherited(self) -> None:
+        # unique_id -> {column: (distance, description)} inherited from upstream
+        self._inherited: Dict[str, Dict[str, Tuple[int, str]]] = {}
+        self._inherited_lock = threading.Lock()
+
+    def to_state(self) -> dict:
+        """
+        Return the attributes persisted in the sidecar file.
+
+        Returns:
+            Dictionary that ``from_state`` turns back into an index
+        """
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def _precedence(self, node: dict):
+        is_root = node.get("package_name") == self.project_name
+        version = node.get("version")
+        is_latest = version is None or str(version) == str(node.get("latest_version", version))
+        return (is_root, is_latest)
+
+    def _add_model(self, unique_id: str, node: dict) -> None:
+        name = node.get("name")
+        path = node.get("original_file_path")
+        if not name:
+            return
+
+        keys = [name, f"{node.get('package_name')}.{name}"]
+        if node.get("version") is not None:
+            keys.append(f"{name}.v{node['version']}")
+
+        checksum = (node.get("checksum") or {}).get("checksum")
+        # "project://models/schema.yml"; files of installed packages are not ours to edit
+        patch_path = node.get("patch_path") if node.get("package_name") == self.project_name else None
+        for key in keys:
+            self._unique_ids[key.lower()] = unique_id
+            if checksum:
+                self._checksums[key.lower()] = checksum
+            if path:
+                self._paths[key.lower()] = path
+            if patch_path:
+                self._patch_paths[key.lower()] = patch_path.split("://", 1)[-1]
+
+    def _add_columns(self, unique_id: str, node: dict) -> None:
+        described = {
+            str(column.get("name") or name).lower(): column["description"]
+            for name, column in (node.get("columns") or {}).items()
+            if isinstance(column, dict) and column.get("description")
+        }
+        if described:
+            self._column_descriptions[unique_id] = described
+
+    def _add_tags(self, node: dict) -> None:
+        name = node.get("name")
+        if not name:
+            return
+
+        config_tags = node.get("config", {}).get("tags") or []
+        if isinstance(config_tags, str):
+            config_tags = [config_tags]
+
+        for tag in dict.fromkeys(list(node.get("tags") or []) + list(config_tags)):
+            self._tags.setdefault(tag, {})[name] = None
+
+    def models_for_tag(self, tag: str) -> List[str]:
+        """
+        Return the names of the models carrying a tag.
+
+        Args:
+            tag: Tag name without the ``tag:`` prefix
+
+        Returns:
+            Model names in unique_id order (empty if the tag is unknown)
+        """
+        return list(self._tags.get(tag, []))
+
+    def get_unique_id(self, model_name: str) -> Optional[str]:
+        """
+        Return the unique_id of a model.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            The model's unique_id or None if unknown
+        """
+        return self._unique_ids.get(model_name.lower())
+
+    def get_checksum(self, model_name: str) -> Optional[str]:
+        """
+        Return the checksum dbt recorded for a model's SQL file.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            The checksum or None if unknown
+        """
+        return self._checksums.get(model_name.lower())
+
+    def get_upstream_ids(self, model_name: str) -> List[str]:
+        """
+        Return the unique_ids of the nodes a model depends on.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            The model's ``depends_on.nodes`` (empty if the model is unknown)
+        """
+        unique_id = self.get_unique_id(model_name)
+        return list(self._upstream.get(unique_id, [])) if unique_id else []
+
+    def _resolve_inherited(self, unique_id: str) -> Dict[str, Tuple[int, str]]:
+        # Post-order walk of the ancestors, so each node merges parents that
+        # are already resolved; iterative to cope with deep lineage
+        inherited = self._inherited
+        visiting = set()
+        stack = [(unique_id, False)]
+        while stack:
+            node, parents_done = stack.pop()
+            if node in inherited:
+                continue
+            parents = self._upstream.get(node, [])
+            if not parents_done:
+                visiting.add(node)
+                stack.append((node, True))
+                # A cycle (never produced by dbt) is cut at the revisited node
+                stack.extend((parent, False) for parent in reversed(parents)
+                             if parent not in inherited and parent not in visiting)
+                continue
+
+            merged: Dict[str, Tuple[int, str]] = {}
+            if parents:
+                # The first parent cannot lose a tie, so take it wholesale
+                merged = {
+                    column: (distance + 1, description)
+                    for column, (distance, description) in inherited.get(parents[0], {}).items()
+                }
+                merged.update((column, (1, description))
+                              for column, description in self._column_descriptions.get(parents[0], {}).items())
+            for parent in parents[1:]:
+                for column, description in self._column_descriptions.get(parent, {}).items():
+                    if column not in merged or merged[column][0] > 1:
+                        merged[column] = (1, description)
+                for column, (distance, description) in inherited.get(parent, {}).items():
+                    if column not in merged or merged[column][0] > distance + 1:
+                        merged[column] = (distance + 1, description)
+            inherited[node] = merged
+            visiting.discard(node)
+        return inherited[unique_id]
+
+    def upstream_descriptions(self, model_name: str) -> Dict[str, str]:
+        """
+        Return the nearest upstream description of every column a model can inherit.
+
+        Each column takes the description from the closest ancestor (fewest
+        ``depends_on`` hops) that documents a column of the same name; at
+        equal distance, parents listed first in ``depends_on`` win. Results
+        are memoized per node, so a DAG is resolved at most once per run.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            Descriptions by lower-cased column name (empty if the model is unknown)
+        """
+        unique_id = self.get_unique_id(model_name)
+        if unique_id is None:
+            return {}
+        with self._inherited_lock:
+            resolved = self._resolve_inherited(unique_id)
+        return {column: description for column, (_, description) in resolved.items()}
+
+    def get_model_path(self, model_name: str) -> Optional[str]:
+        """
+        Return the SQL path of a model as dbt ls would print it.
+
+        Paths that no longer exist on disk are treated as unknown, so callers
+        fall back to dbt when the manifest predates a moved or renamed model.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            The model's ``original_file_path`` or None if unknown
+        """
+        path = self._paths.get(model_name.lower())
+        if path is None:
+            return None
+
+        on_disk = self.project_dir / path if self.project_dir else Path(path)
+        if not on_disk.exists():
+            return None
+        return path
+
+    def get_patch_path(self, model_name: str) -> Optional[str]:
+        """
+        Return the properties file that documents a root-project model.
+
+        Like SQL paths, files that no longer exist on disk are treated as unknown.
+
+        Args:
+            model_name: Model name, ``package.name`` or ``name.v<version>``
+
+        Returns:
+            The YAML file's path relative to the project root, or None if the
+            model has no properties file
+        """
+        path = self._patch_paths.get(model_name.lower())
+        if path is None:
+            return None
+
+        on_disk = self.project_dir / path if self.project_dir else Path(path)
+        if not on_disk.exists():
+            return None
+        return path
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+def is_manifest_stale(manifest_path: Path, project_dir: Path) -> bool:
+    """
+    Check whether the manifest is older than the project configuration.
+
+    Args:
+        manifest_path: Path to manifest.json
+        project_dir: dbt project root
+
+    Returns:
+        True if dbt_project.yml was modified after the manifest was written
+    """
+    try:
+        manifest_mtime = os.path.getmtime(manifest_path)
+        project_mtime = os.path.getmtime(project_dir / "dbt_project.yml")
+    except OSError:
+        return True
+    return project_mtime > manifest_mtime
+
+
+def _file_digest(path: Path) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_sidecar(sidecar_path: Path, manifest_path: Path, stat: os.stat_result) -> Optional[dict]:
+    """
+    Return the index state stored for this exact manifest, or None.
+
+    Size and mtime identify the manifest cheaply. When only the mtime moved
+    (the manifest was rewritten with the same size) the content hash decides,
+    and a match refreshes the stored mtime.
+    """
+    import marshal
+
+    try:
+        with open(sidecar_path, "rb") as f:
+            sidecar = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(sidecar, dict) or sidecar.get("format") != _SIDECAR_FORMAT \
+            or sidecar.get("python") != list(sys.version_info[:2]) or sidecar.get("size") != stat.st_size:
+        return None
+
+    if sidecar.get("mtime_ns") != stat.st_mtime_ns:
+        try:
+            if _file_digest(manifest_path) != sidecar.get("sha256"):
+                return None
+        except OSError:
+            return None
+        _write_sidecar(sidecar_path, stat, sidecar["sha256"], sidecar["state"])
+
+    return sidecar["state"]
+
+
+def _write_sidecar(sidecar_path: Path, stat: os.stat_result, digest: str, state: dict) -> None:
+    import marshal
+    import tempfile
+
+    sidecar = {
+        "format": _SIDECAR_FORMAT,
+        "python": list(sys.version_info[:2]),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "state": state,
+    }
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(prefix=".dbt_yamer_index.", dir=str(sidecar_path.parent))
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps(sidecar))
+        os.replace(temp_path, sidecar_path)
+    except (OSError, ValueError):
+        # The sidecar is only an accelerator; a read-only target/ is fine
+        if temp_path is not None and os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+def load_manifest_index(
+    manifest_path: Path,
+    project_dir: Path,
+    manifest_data: Optional[dict] = None
+) -> Optional[ManifestIndex]:
+    """
+    Build a manifest index, or return None when the manifest cannot be trusted.
+
+    The compiled index is stored in a sidecar file next to the manifest and
+    loaded from there while the manifest is unchanged, so later runs skip
+    parsing the manifest entirely. A changed manifest rebuilds the sidecar.
+
+    Args:
+        manifest_path: Path to manifest.json
+        project_dir: dbt project root
+        manifest_data: Already loaded manifest, if the caller has one
+
+    Returns:
+        ManifestIndex, or None if the manifest is missing, unreadable or stale
+    """
+    if not Path(manifest_path).exists() or is_manifest_stale(Path(manifest_path), project_dir):
+        return None
+
+    cache_key = (os.path.realpath(manifest_path), str(project_dir))
+    try:
+        stat = os.stat(manifest_path)
+    except OSError:
+        return None
+    fingerprint = (stat.st_size, stat.st_mtime_ns)
+
+    with _index_cache_lock:
+        cached = _index_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    sidecar_path = Path(manifest_path).parent / INDEX_SIDECAR_NAME
+    state = _read_sidecar(sidecar_path, Path(manifest_path), stat)
+    if state is not None:
+        index = ManifestIndex.from_state(state, project_dir)
+    else:
+        if manifest_data is None:
+            from dbt_yamer.handlers.docblock import GENERATION_SECTIONS, load_manifest
+            try:
+                manifest_data = load_manifest(str(manifest_path), GENERATION_SECTIONS)
+            except ManifestError:
+                return None
+
+        index = ManifestIndex(manifest_data, project_dir)
+        try:
+            _write_sidecar(sidecar_path, stat, _file_digest(Path(manifest_path)), index.to_state())
+        except OSError:
+            pass
+
+    with _index_cache_lock:
+        _index_cache[cache_key] = (fingerprint, index)
+    return index
+
+
+def clear_index_cache() -> None:
+    """Forget every manifest index built by this process."""
+    with _index_cache_lock:
+        _index_cache.clear()
@@ -0,0 +1,82 @@
+"""
+Model entries in the shape written to schema YAML files.
+"""
+from typing import Iterable, Iterator, List, Optional
+
+from dbt_yamer.exceptions import ValidationError
+
+
+def column_entry(name: str, data_type: Optional[str] = None, description: str = "") -> dict:
+    """
+    Build a column entry the way ``dbt_yamer_data_type_format_model`` does.
+
+    Args:
+        name: Column name (nested fields as ``parent.child``)
+        data_type: Column type as reported by the warehouse, None to omit it
+        description: Column description
+
+    Returns:
+        Column dictionary with name, data type(s) and description
+    """
+    column = {"name": name.lower()}
+    if data_type is not None:
+        if "ARRAY<STRUCT<" in data_type:
+            column["data_type"] = "ARRAY"
+            column["type"] = "RECORD REPEATED"
+        else:
+            column["data_type"] = data_type
+    column["description"] = description
+    return column
+
+
+def model_entry(name: str, columns: List[dict]) -> dict:
+    """
+    Build a model entry with an enforced contract.
+
+    Args:
+        name: Model name
+        columns: Column entries
+
+    Returns:
+        Model dictionary as produced by the generation macro
+    """
+    return {
+        "name": name.lower(),
+        "description": "",
+        "config": {"contract": {"enforced": True}},
+        "columns": columns,
+    }
+
+
+def _flatten_columns(columns: Iterable[dict], parent_name: str = "") -> Iterator[dict]:
+    for column in columns:
+        name = f"{parent_name}.{column['name']}" if parent_name else column["name"]
+        yield column_entry(name, column.get("data_type"), column.get("description") or "")
+        yield from _flatten_columns(column.get("fields") or [], name)
+
+
+def model_entry_from_json(document: dict) -> dict:
+    """
+    Build a model entry from the generation macro's JSON output.
+
+    Nested ``fields`` are flattened depth-first into ``parent.child``
+    columns, in the same order the YAML output lists them.
+
+    Args:
+        document: Parsed JSON with ``name`` and ``columns``
+
+    Returns:
+        Model dictionary as produced by the generation macro
+
+    Raises:
+        ValidationError: If the document is not a model
+    """
+    if not isinstance(document, dict) or not document.get("name"):
+        raise ValidationError("Model JSON must be an object with a 'name'")
+
+    try:
+        columns = list(_flatten_columns(document.get("columns") or []))
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValidationError(f"Invalid column in model JSON for '{document['name']}': {e}")
+
+    return model_entry(document["name"], columns)
@@ -0,0 +1,194 @@
+"""
+Merge generated columns into a model's existing properties file.
+"""
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dbt_yamer.exceptions import DbtYamerError, FileOperationError, ValidationError
+
+# Several models may share one properties file; merges into it are serialized
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path: Path) -> threading.Lock:
+    key = os.path.abspath(path)
+    with _file_locks_guard:
+        return _file_locks.setdefault(key, threading.Lock())
+
+
+def merge_columns(existing: list, columns: List[dict]) -> Tuple[list, bool]:
+    """
+    Merge generated columns into a model's existing column entries.
+
+    Columns keep the order the warehouse reports them in. A column that is
+    already documented keeps its entry, including tests, constraints and its
+    description; only its ``data_type`` is updated, and an empty description
+    is filled from the generated one. New columns are added and columns that
+    no longer exist are dropped.
+
+    Args:
+        existing: Column entries from the properties file (may be modified)
+        columns: Generated column entries with name, data_type and description
+
+    Returns:
+        Tuple of (merged column list, whether anything changed)
+    """
+    by_name = {}
+    for entry in existing or []:
+        if isinstance(entry, dict) and entry.get("name"):
+            by_name.setdefault(str(entry["name"]).lower(), entry)
+
+    merged = []
+    changed = False
+    for column in columns:
+        name = str(column["name"])
+        entry = by_name.get(name.lower())
+        if entry is None:
+            entry = {
+                "name": name,
+                "data_type": str(column.get("data_type", "")),
+                "description": str(column.get("description", "")),
+            }
+            changed = True
+        else:
+            data_type = column.get("data_type")
+            if data_type is not None and entry.get("data_type") != str(data_type):
+                if "data_type" in entry or not hasattr(entry, "insert"):
+                    entry["data_type"] = str(data_type)
+                else:
+                    # Right after the name, where generated entries have it
+                    position = list(entry).index("name") + 1 if "name" in entry else 0
+                    entry.insert(position, "data_type", str(data_type))
+                changed = True
+            if not entry.get("description") and column.get("description"):
+                entry["description"] = str(column["description"])
+                changed = True
+        merged.append(entry)
+
+    if len(merged) != len(existing or []) or any(a is not b for a, b in zip(merged, existing or [])):
+        changed = True
+    return merged, changed
+
+
+def round_trip_yaml():
+    """
+    Return a ruamel.yaml round-trip loader/dumper.
+
+    Returns:
+        YAML instance that preserves comments, quoting and layout
+
+    Raises:
+        DbtYamerError: If ruamel.yaml is not installed
+    """
+    try:
+        from ruamel.yaml import YAML
+    except ImportError:
+        raise DbtYamerError('--merge needs ruamel.yaml; install it with: pip install "dbt-yamer[merge]"')
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    return yaml
+
+
+def _load(text: str, round_trip) -> dict:
+    from ruamel.yaml.util import load_yaml_guess_indent
+
+    # Only the indentation is taken from the guess; the document itself is
+    # loaded by round_trip so its settings (preserved quotes) apply
+    _, indent, block_seq_indent = load_yaml_guess_indent(text)
+    round_trip.indent(mapping=block_seq_indent or 2, sequence=indent or 2, offset=block_seq_indent or 0)
+    return round_trip.load(text)
+
+
+def _dump(data: dict, round_trip) -> str:
+    from io import StringIO
+
+    stream = StringIO()
+    round_trip.dump(data, stream)
+    return stream.getvalue()
+
+
+def _replace_file(path: Path, text: str) -> None:
+    # Write next to the target and rename over it, keeping its permissions
+    mode = os.stat(path).st_mode & 0o777
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def merge_model_yaml(path: Path, model: str, columns: List[dict]) -> Optional[bool]:
+    """
+    Update one model's columns in an existing properties file.
+
+    Only that model's ``columns`` block is touched; other models, tests and
+    descriptions are left as they are, and ruamel.yaml keeps comments,
+    quoting and layout. The file is rewritten only if the columns actually
+    change, so dbt's partial parsing does not see an edit otherwise.
+
+    Args:
+        path: Properties file that documents the model
+        model: Model name
+        columns: Generated column entries with name, data_type and description
+
+    Returns:
+        True if the file was rewritten, False if it was already up to date,
+        or None if the file does not describe the model (or only its versions)
+
+    Raises:
+        DbtYamerError: If ruamel.yaml is not installed
+        ValidationError: If the file is not valid YAML
+        FileOperationError: If the file cannot be read or written
+    """
+    path = Path(path)
+    round_trip = round_trip_yaml()
+
+    with _file_lock(path):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError as e:
+            raise FileOperationError(f"Could not read {path}: {e}")
+
+        try:
+            data = _load(text, round_trip)
+        except Exception as e:
+            raise ValidationError(f"Invalid YAML in {path}: {e}")
+
+        models = data.get("models") if isinstance(data, dict) else None
+        entry = next(
+            (
+                item for item in models or []
+                if isinstance(item, dict) and str(item.get("name", "")).lower() == model.lower()
+            ),
+            None
+        )
+        # Versioned models declare columns per version; leave those to the user
+        if entry is None or "versions" in entry:
+            return None
+
+        merged, changed = merge_columns(entry.get("columns") or [], columns)
+        if not changed:
+            return False
+        if entry.get("columns") is not None:
+            entry["columns"][:] = merged
+        else:
+            entry["columns"] = merged
+
+        updated = _dump(data, round_trip)
+        if updated == text:
+            return False
+        try:
+            _replace_file(path, updated)
+        except OSError as e:
+            raise FileOperationError(f"Could not write {path}: {e}")
+        return True
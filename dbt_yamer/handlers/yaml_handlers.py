@@ -1,7 +1,12 @@
 import yaml
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
 from dbt_yamer.exceptions import ValidationError
 
+# PyYAML's default line width; longer scalars may be folded by the dumper
+_YAML_WIDTH = 80
+_STR_TAG = "tag:yaml.org,2002:str"
+
 class MyDumper(yaml.Dumper):
     """
     A custom YAML dumper that overrides the increase_indent and write_line_break methods
@@ -114,13 +119,46 @@ def format_yaml(input_yaml: str) -> str:
     except yaml.YAMLError as e:
         raise ValidationError(f"Invalid YAML: {e}")
     
+    return format_yaml_data(data)
+
+
+def format_yaml_data(data: Dict[str, Any]) -> str:
+    """
+    Serializes a schema document in the layout produced by ``format_yaml``.
+    
+    Use this when the document is already in memory, so it is dumped once
+    instead of being dumped, parsed and dumped again. The input is not
+    modified. Documents in the shape dbt-yamer generates are written in a
+    single pass with the same bytes PyYAML would produce; others are dumped
+    with ``MyDumper``.
+    
+    Args:
+        data: Schema document with an optional ``models`` list
+        
+    Returns:
+        Formatted YAML string
+        
+    Raises:
+        ValidationError: If the document is invalid
+    """
     if not isinstance(data, dict):
         raise ValidationError("YAML must contain a dictionary at root level")
 
-    for model in data.get('models', []):
-        if 'columns' in model:
-            model['columns'] = format_columns(model['columns'])
+    if isinstance(data.get('models'), list):
+        data = dict(data)
+        data['models'] = [
+            dict(model, columns=format_columns(model['columns'])) if isinstance(model, dict) and 'columns' in model else model
+            for model in data['models']
+        ]
 
+    formatted_yaml = _emit_schema(data)
+    if formatted_yaml is None:
+        formatted_yaml = _dump_schema(data)
+    return formatted_yaml
+
+
+def _dump_schema(data: Dict[str, Any]) -> str:
+    # MyDumper output with the layout fix-ups format_yaml_data promises
     try:
         formatted_yaml = yaml.dump(data, Dumper=MyDumper, sort_keys=False, allow_unicode=True)
         formatted_yaml = formatted_yaml.replace("  config:\n\n", "  config:\n")
@@ -129,3 +167,159 @@ def format_yaml(input_yaml: str) -> str:
         return formatted_yaml
     except yaml.YAMLError as e:
         raise ValidationError(f"Error formatting YAML: {e}")
+
+
+@lru_cache(maxsize=None)
+def _scalar_analyzer():
+    return yaml.emitter.Emitter(None, allow_unicode=True), yaml.resolver.Resolver()
+
+
+@lru_cache(maxsize=8192)
+def _emit_str(value: str) -> Optional[str]:
+    # The plain or single-quoted form MyDumper picks for a block mapping
+    # value, or None for multi-line and double-quoted scalars
+    emitter, resolver = _scalar_analyzer()
+    analysis = emitter.analyze_scalar(value)
+    if analysis.multiline:
+        return None
+    if analysis.allow_block_plain and resolver.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG:
+        return value
+    if analysis.allow_single_quoted:
+        return "'" + value.replace("'", "''") + "'"
+    return None
+
+
+def _emit_scalar(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return _emit_str(value)
+    return None
+
+
+def _fold(value: str, plain: bool, column: int, indent: int, blank_line: bool) -> str:
+    # PyYAML's write_plain / write_single_quoted: a single space reached past
+    # the width becomes a line break (doubled by MyDumper at model level)
+    line_break = "\n\n" if blank_line else "\n"
+    pieces = [] if plain else ["'"]
+    spaces = False
+    start = end = 0
+    while end <= len(value):
+        ch = value[end] if end < len(value) else None
+        if spaces:
+            if ch != " ":
+                if start + 1 == end and column > _YAML_WIDTH and (plain or (start != 0 and end != len(value))):
+                    pieces.append(line_break + " " * indent)
+                    column = indent
+                else:
+                    pieces.append(value[start:end])
+                    column += end - start
+                start = end
+        elif ch is None or ch == " " or (ch == "'" and not plain):
+            if start < end:
+                pieces.append(value[start:end])
+                column += end - start
+                start = end
+        if ch == "'" and not plain:
+            pieces.append("''")
+            column += 2
+            start = end + 1
+        if ch is not None:
+            spaces = ch == " "
+        end += 1
+    if not plain:
+        pieces.append("'")
+    return "".join(pieces)
+
+
+def _emit_line(lines: List[str], prefix: str, key: Any, value: Any) -> bool:
+    # A "key: value" line, folded the way the dumper folds long scalars
+    # Longer keys become "? key" entries (PyYAML counts the "!!str" tag too)
+    if not isinstance(key, str) or len(key) + 5 >= 128 or _emit_str(key) != key:
+        return False
+    text = _emit_scalar(value)
+    if text is None:
+        return False
+    line = f"{prefix}{key}: {text}"
+    if len(line) > _YAML_WIDTH and " " in text:
+        plain = text == value
+        column = len(prefix) + len(key) + (2 if plain else 3)
+        folded = _fold(value, plain, column, len(prefix) + 2, len(prefix) == 4)
+        line = f"{prefix}{key}: {folded}"
+        # The layout fix-ups of format_yaml_data also apply inside folded text
+        line = line.replace("  config:\n\n", "  config:\n")
+        line = line.replace("version: 2\n", "version: 2\n\n")
+        line = line.replace("columns:\n", "columns:")
+    lines.append(line)
+    return True
+
+
+def _emit_schema(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Write a generated schema document in one pass, or return None.
+
+    Produces exactly the bytes of ``format_yaml_data``'s dump for the shape
+    dbt-yamer generates: ``version`` and ``models``, each model holding string
+    properties, a ``config`` with a ``contract`` of scalars and formatted
+    ``columns``. Anything else (other keys or types, shared objects the
+    dumper would anchor, multi-line or double-quoted strings) returns None
+    so the caller falls back to PyYAML.
+
+    Args:
+        data: Schema document with columns already passed through ``format_columns``
+
+    Returns:
+        Formatted YAML string, or None if the document needs PyYAML
+    """
+    if list(data) != ["version", "models"] or type(data["version"]) is not int:
+        return None
+    models = data["models"]
+    if not isinstance(models, list):
+        return None
+
+    lines = [f"version: {data['version']}", ""]
+    if not models:
+        lines.append("models: []")
+        return "\n".join(lines) + "\n"
+    lines.append("models:")
+
+    seen = set()
+    for model in models:
+        if not isinstance(model, dict) or not model or id(model) in seen:
+            return None
+        seen.add(id(model))
+
+        prefix = "  - "
+        for key, value in model.items():
+            if key == "config" and isinstance(value, dict):
+                contract = value.get("contract")
+                if list(value) != ["contract"] or not isinstance(contract, dict) or not contract \
+                        or id(value) in seen or id(contract) in seen:
+                    return None
+                seen.update((id(value), id(contract)))
+                lines.append(f"{prefix}config:")
+                # format_yaml_data only strips the dumper's blank line after an indented "config:"
+                if prefix == "  - ":
+                    lines.append("")
+                lines.append("      contract:")
+                for contract_key, contract_value in contract.items():
+                    if not _emit_line(lines, "        ", contract_key, contract_value):
+                        return None
+            elif key == "columns" and isinstance(value, list):
+                if not value:
+                    lines.append(f"{prefix}columns: []")
+                    prefix = "    "
+                    continue
+                lines.append(f"{prefix}columns:")
+                for position, column in enumerate(value):
+                    if position:
+                        lines.append("")
+                    if not (_emit_line(lines, "      - ", "name", column["name"])
+                            and _emit_line(lines, "        ", "data_type", column["data_type"])
+                            and _emit_line(lines, "        ", "description", column["description"])):
+                        return None
+            elif not isinstance(value, str) or not _emit_line(lines, prefix, key, value):
+                return None
+            prefix = "    "
+
+    return "\n".join(lines) + "\n"
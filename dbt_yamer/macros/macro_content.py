@@ -17,7 +17,7 @@ generate_yaml_macro = """
     {% do model_yaml.append('        description: "' ~ column_desc_dict.get(column.name | lower,'') ~ '"') %}
     {% do model_yaml.append('') %}
 
-    {% if column.fields|length > 0 %}
+    {% if column.fields is defined and column.fields|length > 0 %}
         {% for child_column in column.fields %}
             {% set model_yaml = default__dbt_yamer_generate_column_yaml(child_column, model_yaml, column_desc_dict, include_data_types, parent_column_name=column_name) %}
         {% endfor %}
@@ -25,11 +25,25 @@ generate_yaml_macro = """
     {% do return(model_yaml) %}
 {% endmacro %}
 
-{% macro dbt_yamer_generate_contract_yaml(model_names=[], upstream_descriptions=False, include_data_types=True) -%}
-  {{ return(default__dbt_yamer_generate_model_yaml(model_names, upstream_descriptions, include_data_types)) }}
+{% macro dbt_yamer_generate_column_json(column, column_desc_dict, include_data_types) %}
+    {% set fields = [] %}
+    {% if column.fields is defined %}
+        {% for child_column in column.fields %}
+            {% do fields.append(dbt_yamer_generate_column_json(child_column, column_desc_dict, include_data_types)) %}
+        {% endfor %}
+    {% endif %}
+    {% set column_json = {'name': column.name, 'description': column_desc_dict.get(column.name | lower, ''), 'fields': fields} %}
+    {% if include_data_types %}
+        {% do column_json.update({'data_type': column.data_type}) %}
+    {% endif %}
+    {{ return(column_json) }}
+{% endmacro %}
+
+{% macro dbt_yamer_generate_contract_yaml(model_names=[], upstream_descriptions=False, include_data_types=True, bulk_introspection=False, output_format='yaml') -%}
+  {{ return(default__dbt_yamer_generate_model_yaml(model_names, upstream_descriptions, include_data_types, bulk_introspection, output_format)) }}
 {%- endmacro %}
 
-{% macro default__dbt_yamer_generate_model_yaml(model_names, upstream_descriptions, include_data_types) %}
+{% macro default__dbt_yamer_generate_model_yaml(model_names, upstream_descriptions, include_data_types, bulk_introspection=False, output_format='yaml') %}
 
     {% set model_yaml=[] %}
 
@@ -40,7 +54,9 @@ generate_yaml_macro = """
     {% if model_names is string %}
         {{ exceptions.raise_compiler_error("The `model_names` argument must always be a list, even if there is only one model.") }}
     {% else %}
+        {% set bulk_columns = dbt_yamer_get_columns_bulk(model_names) if bulk_introspection else {} %}
         {% for model in model_names %}
+            {% set model_start = model_yaml | length %}
             {% do model_yaml.append('  - name: ' ~ model | lower) %}
             {% do model_yaml.append('    description: ""') %}
             {% do model_yaml.append('    config:') %}
@@ -49,25 +65,81 @@ generate_yaml_macro = """
             {% do model_yaml.append('    columns:') %}
 
             {% set relation = ref(model) %}
-            {%- set columns = adapter.get_columns_in_relation(relation) -%}
+            {%- set columns = bulk_columns[model] if model in bulk_columns else adapter.get_columns_in_relation(relation) -%}
             {% set column_desc_dict =  dbt_yamer_build_dict_column_descriptions(model) if upstream_descriptions else {} %}
 
-            {% for column in columns %}
-                {% set model_yaml = default__dbt_yamer_generate_column_yaml(column, model_yaml, column_desc_dict, include_data_types) %}
-            {% endfor %}
+            {#- Frame each model so the caller can slice it out of dbt's output -#}
+            {% if output_format == 'json' %}
+                {% set columns_json = [] %}
+                {% for column in columns %}
+                    {% do columns_json.append(dbt_yamer_generate_column_json(column, column_desc_dict, include_data_types)) %}
+                {% endfor %}
+                {% if execute %}
+                    {{ print('__DBT_YAMER_BEGIN__ ' ~ model | lower ~ '\n' ~ tojson({'name': model | lower, 'columns': columns_json}) ~ '\n__DBT_YAMER_END__ ' ~ model | lower) }}
+                {% endif %}
+            {% else %}
+                {% for column in columns %}
+                    {% set model_yaml = default__dbt_yamer_generate_column_yaml(column, model_yaml, column_desc_dict, include_data_types) %}
+                {% endfor %}
+                {% if execute %}
+                    {{ print('__DBT_YAMER_BEGIN__ ' ~ model | lower ~ '\nversion: 2\n\nmodels:\n' ~ (model_yaml[model_start:] | join('\n')) ~ '\n__DBT_YAMER_END__ ' ~ model | lower) }}
+                {% endif %}
+            {% endif %}
         {% endfor %}
     {% endif %}
 
 {% if execute %}
 
     {% set joined = model_yaml | join ('\n') %}
-    {{ print(joined) }}
     {% do return(joined) %}
 
 {% endif %}
 
 {% endmacro %}
 
+{% macro dbt_yamer_get_columns_bulk(model_names) %}
+    {#- One information_schema.columns query per database/schema instead of one
+        metadata query per relation. Models without rows in the result (e.g.
+        views the information schema can't see) are left out so the caller
+        falls back to adapter.get_columns_in_relation. Nested struct fields
+        are not expanded. -#}
+    {% set schemas = {} %}
+    {% for model in model_names %}
+        {% set relation = ref(model) %}
+        {% set schema_key = (relation.database ~ '.' ~ relation.schema) | lower %}
+        {% if schema_key not in schemas %}
+            {% do schemas.update({schema_key: {'relation': relation, 'models': {}}}) %}
+        {% endif %}
+        {% do schemas[schema_key]['models'].update({relation.identifier | lower: model}) %}
+    {% endfor %}
+
+    {% set columns_by_model = {} %}
+    {% for schema_key, group in schemas.items() %}
+        {% set columns_query %}
+            select table_name, column_name, data_type
+            from {{ group['relation'].information_schema('columns') }}
+            where lower(table_schema) = '{{ group['relation'].schema | lower }}'
+              and lower(table_name) in (
+                {%- for identifier in group['models'] -%}
+                    '{{ identifier }}'{% if not loop.last %}, {% endif %}
+                {%- endfor -%}
+              )
+            order by table_name, ordinal_position
+        {% endset %}
+        {% set result = run_query(columns_query) %}
+        {% for row in result.rows %}
+            {% set model = group['models'].get(row[0] | lower) %}
+            {% if model %}
+                {% if model not in columns_by_model %}
+                    {% do columns_by_model.update({model: []}) %}
+                {% endif %}
+                {% do columns_by_model[model].append(api.Column.create(row[1], row[2])) %}
+            {% endif %}
+        {% endfor %}
+    {% endfor %}
+    {{ return(columns_by_model) }}
+{% endmacro %}
+
 {% macro dbt_yamer_data_type_format_model(column) %}
     {% if 'ARRAY<STRUCT<' in column.data_type %}
         {{ return('        data_type: ARRAY\n        type: RECORD REPEATED') }}
@@ -76,6 +148,8 @@ generate_yaml_macro = """
     {% endif %}
 {% endmacro %}
 
+{#- dbt-yamer inherits upstream descriptions in Python from the manifest DAG
+    (--upstream-descriptions); this hook stays for callers of the macro. -#}
 {% macro dbt_yamer_build_dict_column_descriptions(model) %}
     {% set descriptions = {} %}
     {{ return(descriptions) }}
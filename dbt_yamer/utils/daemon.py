@@ -0,0 +1,394 @@
+"""
+Optional long-lived dbt-yamer daemon and its thin client.
+
+The daemon serves one dbt project over a Unix socket. It runs the regular
+``yaml``/``md``/``yamd`` commands inside its own process, so the loaded
+manifest, manifest index, in-process dbt runner (with its parsed project) and
+installed generation macro stay warm between requests. Before every request
+it fingerprints the project (manifest size/mtime and a hash of
+dbt_project.yml) and reloads everything if either changed.
+
+Commands run with the client's environment. The project the daemon parsed
+depends on the ``DBT_*`` variables (profiles directory, target, ``env_var()``
+values), so when those differ from the daemon's the command runs locally.
+
+Protocol: the client sends one JSON line ``{"argv": [...], "cwd": "...", "env": {...}}``
+(or ``{"command": "ping" | "shutdown"}``); the daemon answers with JSON lines
+``{"stdout": "..."}`` / ``{"stderr": "..."}`` and a final ``{"exit_code": n}``,
+or ``{"status": "run-locally"}`` if it cannot serve that environment.
+"""
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from dbt_yamer.exceptions import DbtYamerError
+
+# Commands that are forwarded to a running daemon
+DAEMON_COMMANDS = ("yaml", "md", "yamd")
+
+# Set to disable forwarding (the daemon sets it for the commands it runs)
+NO_DAEMON_ENV_VAR = "DBT_YAMER_NO_DAEMON"
+
+CONNECT_TIMEOUT = 1.0
+
+# Reply status telling the client to run the command itself
+RUN_LOCALLY = "run-locally"
+
+# Variables that must match the daemon's for a command to be forwarded
+PINNED_ENV_PREFIX = "DBT_"
+
+
+def daemon_supported() -> bool:
+    """Unix sockets are required."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path_for(project_dir: Path) -> Path:
+    """
+    Socket path for a project's daemon.
+
+    Kept in the temp directory rather than the project because Unix socket
+    paths are limited to ~100 characters.
+
+    Args:
+        project_dir: dbt project root
+
+    Returns:
+        Path of the Unix socket
+    """
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(str(Path(project_dir).resolve()).encode("utf-8")).hexdigest()[:12]
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"dbt-yamer-{uid}-{digest}.sock"
+
+
+def _pinned_environment(env) -> dict:
+    return {
+        name: value for name, value in env.items()
+        if name.startswith(PINNED_ENV_PREFIX) and name != NO_DAEMON_ENV_VAR
+    }
+
+
+def _connect(sock_path: Path) -> Optional[socket.socket]:
+    if not daemon_supported() or not sock_path.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT)
+    try:
+        client.connect(str(sock_path))
+    except OSError:
+        client.close()
+        return None
+    client.settimeout(None)
+    return client
+
+
+def send_request(project_dir: Path, request: dict, on_output=None) -> Optional[dict]:
+    """
+    Send a request to the project's daemon and collect the reply.
+
+    Args:
+        project_dir: dbt project root
+        request: Request object
+        on_output: Called with (stream_name, text) for streamed output
+
+    Returns:
+        The final reply object, or None if no daemon is listening
+    """
+    client = _connect(socket_path_for(project_dir))
+    if client is None:
+        return None
+
+    with client, client.makefile("r", encoding="utf-8") as replies:
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        for line in replies:
+            message = json.loads(line)
+            if "exit_code" in message or "status" in message:
+                return message
+            if on_output is not None:
+                for stream in ("stdout", "stderr"):
+                    if stream in message:
+                        on_output(stream, message[stream])
+
+    return {"exit_code": 1, "error": "daemon closed the connection"}
+
+
+def forward_to_daemon(argv: List[str]) -> Optional[int]:
+    """
+    Run a CLI invocation through the project's daemon if one is running.
+
+    Args:
+        argv: Command-line arguments after the program name
+
+    Returns:
+        The command's exit code, or None if it should run locally
+    """
+    if not argv or argv[0] not in DAEMON_COMMANDS or os.environ.get(NO_DAEMON_ENV_VAR):
+        return None
+    if "--help" in argv:
+        return None
+
+    from dbt_yamer.handlers.file_handlers import find_dbt_project_root
+    try:
+        project_dir = find_dbt_project_root()
+    except DbtYamerError:
+        return None
+
+    import click
+
+    def echo(stream, text):
+        click.echo(text, nl=False, err=(stream == "stderr"))
+
+    try:
+        reply = send_request(project_dir, {"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}, echo)
+    except (OSError, ValueError):
+        return None
+    if reply is None:
+        return None
+    if reply.get("status") == RUN_LOCALLY:
+        click.echo("ℹ️  DBT_* environment differs from the daemon's; running without it", err=True)
+        return None
+    if reply.get("error"):
+        click.echo(f"❌ dbt-yamer daemon error: {reply['error']}", err=True)
+    return int(reply.get("exit_code", 1))
+
+
+class _SocketStream:
+    """Text stream that forwards writes to the client as JSON lines."""
+
+    encoding = "utf-8"
+
+    def __init__(self, connection: socket.socket, name: str):
+        self._connection = connection
+        self._name = name
+
+    def write(self, text: str) -> int:
+        if isinstance(text, bytes):
+            text = text.decode(self.encoding, errors="replace")
+        if text:
+            payload = json.dumps({self._name: text}) + "\n"
+            try:
+                self._connection.sendall(payload.encode("utf-8"))
+            except OSError:
+                pass  # Client went away; finish the command anyway
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _project_fingerprint(project_dir: Path, manifest_path: Path) -> tuple:
+    import hashlib
+
+    try:
+        with open(project_dir / "dbt_project.yml", "rb") as f:
+            project_hash = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        project_hash = None
+    try:
+        stat = os.stat(manifest_path)
+        manifest_state = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        manifest_state = None
+    return project_hash, manifest_state
+
+
+class DaemonServer:
+    """
+    Serves CLI invocations for one dbt project over a Unix socket.
+
+    Requests are handled one at a time: commands change the working
+    directory and share process-wide state.
+    """
+
+    def __init__(self, project_dir: Path, manifest: str = "target/manifest.json", target: Optional[str] = None):
+        if not daemon_supported():
+            raise DbtYamerError("The dbt-yamer daemon requires Unix domain sockets")
+        self.project_dir = Path(project_dir).resolve()
+        self.manifest_path = self.project_dir / manifest
+        self.target = target
+        self.socket_path = socket_path_for(self.project_dir)
+        self.requests_served = 0
+        self._fingerprint = None
+        self._macro_path = None
+        self._running = False
+        # Environment the project is parsed with, and the variables the
+        # daemon itself sets for every command
+        self._environment = _pinned_environment(os.environ)
+        self._own_environment = {}
+
+    def _install_macro(self) -> None:
+        from dbt_yamer.cli.generate_yaml import use_persistent_macro
+        from dbt_yamer.handlers.file_handlers import get_unique_temp_macro_path
+        from dbt_yamer.macros.macro_content import generate_yaml_macro
+
+        self._macro_path, _ = get_unique_temp_macro_path(self.project_dir / "macros")
+        self._macro_path.write_text(generate_yaml_macro, encoding="utf-8")
+        use_persistent_macro(self._macro_path)
+
+    def _remove_macro(self) -> None:
+        from dbt_yamer.cli.generate_yaml import use_persistent_macro
+
+        use_persistent_macro(None)
+        if self._macro_path is not None and self._macro_path.exists():
+            self._macro_path.unlink()
+
+    def _reload_if_changed(self) -> None:
+        fingerprint = _project_fingerprint(self.project_dir, self.manifest_path)
+        if fingerprint == self._fingerprint:
+            return
+
+        from dbt_yamer.handlers.docblock import clear_manifest_cache, load_manifest
+        from dbt_yamer.handlers.manifest_index import clear_index_cache, load_manifest_index
+        from dbt_yamer.utils.dbt_runner import get_dbt_backend
+
+        reloading = self._fingerprint is not None
+        self._fingerprint = fingerprint
+        clear_manifest_cache()
+        clear_index_cache()
+
+        backend = get_dbt_backend()
+        backend.invalidate()
+        if reloading:
+            print(f"🔁 Project changed, reloading {self.project_dir}", flush=True)
+
+        try:
+            backend.warm_up(self.target, cwd=str(self.project_dir))
+            if self.manifest_path.exists():
+                if load_manifest_index(self.manifest_path, self.project_dir) is None:
+                    load_manifest(str(self.manifest_path), ("docs",))
+        except DbtYamerError as e:
+            print(f"⚠️  Warm-up failed, continuing cold: {e}", flush=True)
+
+        # Parsing during warm-up rewrites manifest.json; don't treat that as a change
+        self._fingerprint = _project_fingerprint(self.project_dir, self.manifest_path)
+
+    def _run_cli(self, request: dict, connection: socket.socket) -> int:
+        import click
+        import contextlib
+        from dbt_yamer.cli.main import cli
+
+        stdout = _SocketStream(connection, "stdout")
+        stderr = _SocketStream(connection, "stderr")
+        original_cwd = os.getcwd()
+        original_environ = dict(os.environ)
+        try:
+            os.environ.clear()
+            os.environ.update(request["env"])
+            os.environ.update(self._own_environment)
+            os.chdir(request.get("cwd") or str(self.project_dir))
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    result = cli.main(args=list(request["argv"]), prog_name="dbt-yamer", standalone_mode=False)
+                    return result if isinstance(result, int) else 0
+                except click.exceptions.Exit as e:
+                    return e.exit_code
+                except click.ClickException as e:
+                    e.show()
+                    return e.exit_code
+                except click.Abort:
+                    click.echo("Aborted!", err=True)
+                    return 1
+        finally:
+            os.chdir(original_cwd)
+            os.environ.clear()
+            os.environ.update(original_environ)
+
+    def _handle(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("r", encoding="utf-8") as requests:
+            line = requests.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {"exit_code": 2, "error": "malformed request"}
+            else:
+                command = request.get("command")
+                if command == "ping":
+                    reply = {"status": "ok", "pid": os.getpid(), "project": str(self.project_dir),
+                             "requests_served": self.requests_served}
+                elif command == "shutdown":
+                    self._running = False
+                    reply = {"status": "stopping", "pid": os.getpid()}
+                elif isinstance(request.get("argv"), list) and (
+                    not isinstance(request.get("env"), dict)
+                    or _pinned_environment(request["env"]) != self._environment
+                ):
+                    reply = {"status": RUN_LOCALLY}
+                elif isinstance(request.get("argv"), list):
+                    try:
+                        self._reload_if_changed()
+                        reply = {"exit_code": self._run_cli(request, connection)}
+                    except Exception as e:
+                        reply = {"exit_code": 1, "error": str(e)}
+                    self.requests_served += 1
+                else:
+                    reply = {"exit_code": 2, "error": "unknown request"}
+            try:
+                connection.sendall((json.dumps(reply) + "\n").encode("utf-8"))
+            except OSError:
+                pass
+
+    def serve_forever(self) -> None:
+        """
+        Bind the socket, warm up and serve requests until asked to stop.
+
+        Raises:
+            DbtYamerError: If a daemon is already serving this project
+        """
+        if send_request(self.project_dir, {"command": "ping"}) is not None:
+            raise DbtYamerError(f"A daemon is already running for {self.project_dir}")
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # Left behind by a daemon that died
+
+        # Turn `kill` into a normal exit so the macro and socket are cleaned up
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+        os.environ[NO_DAEMON_ENV_VAR] = "1"
+        # Keep the parsed project warm unless an engine was chosen explicitly
+        # or dbt-core's programmatic API is not installed
+        import importlib.util
+        from dbt_yamer.utils.dbt_runner import ENGINE_ENV_VAR, INPROCESS_ENGINE, set_dbt_backend
+        if ENGINE_ENV_VAR not in os.environ:
+            try:
+                if importlib.util.find_spec("dbt.cli.main") is not None:
+                    os.environ[ENGINE_ENV_VAR] = INPROCESS_ENGINE
+            except ImportError:
+                pass  # No dbt package at all
+        # Pin the engine actually in use so requests don't retry a failed one
+        os.environ[ENGINE_ENV_VAR] = set_dbt_backend().name
+        self._own_environment = {NO_DAEMON_ENV_VAR: "1", ENGINE_ENV_VAR: os.environ[ENGINE_ENV_VAR]}
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # Create the socket owner-only; chmod after bind would leave a window
+            previous_umask = os.umask(0o177)
+            try:
+                server.bind(str(self.socket_path))
+            finally:
+                os.umask(previous_umask)
+            server.listen()
+
+            self._install_macro()
+            self._reload_if_changed()
+            print(f"🚀 dbt-yamer daemon (pid {os.getpid()}) serving {self.project_dir} on {self.socket_path}", flush=True)
+
+            self._running = True
+            while self._running:
+                connection, _ = server.accept()
+                self._handle(connection)
+        finally:
+            server.close()
+            self._remove_macro()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
@@ -0,0 +1,269 @@
+"""
+Execution backends for dbt commands.
+
+The subprocess backend shells out to the ``dbt`` executable for every call.
+The in-process backend drives dbt-core's programmatic ``dbtRunner`` and parses
+the project once, reusing the resulting manifest for every later ``ls`` and
+``run-operation`` made by the same dbt-yamer process.
+"""
+import contextlib
+import io
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from dbt_yamer.exceptions import DbtProjectError, SubprocessError
+from dbt_yamer.utils.subprocess_utils import run_subprocess, stream_subprocess, validate_dbt_available
+from dbt_yamer.utils.security_utils import build_safe_command
+
+SUBPROCESS_ENGINE = "subprocess"
+INPROCESS_ENGINE = "inprocess"
+ENGINES = (SUBPROCESS_ENGINE, INPROCESS_ENGINE)
+
+# Environment variable used when no engine is chosen on the command line
+ENGINE_ENV_VAR = "DBT_YAMER_ENGINE"
+
+
+class SubprocessBackend:
+    """Runs every dbt command in a fresh ``dbt`` process."""
+
+    name = SUBPROCESS_ENGINE
+
+    def invoke(self, cmd_args: List[str], timeout: Optional[int] = 300, cwd: Optional[str] = None) -> str:
+        """
+        Run a dbt command and return its standard output.
+
+        Args:
+            cmd_args: Arguments following the ``dbt`` executable
+            timeout: Timeout in seconds
+            cwd: Working directory for the command
+
+        Returns:
+            Captured standard output
+
+        Raises:
+            SubprocessError: If the command fails or times out
+        """
+        cmd_list = build_safe_command(["dbt"], cmd_args)
+        result = run_subprocess(cmd_list, capture_output=True, timeout=timeout, cwd=cwd)
+        if not result:
+            raise SubprocessError("No result from dbt command")
+        return result.stdout
+
+    def stream(self, cmd_args: List[str], timeout: Optional[int] = 300, cwd: Optional[str] = None) -> Iterator[str]:
+        """
+        Run a dbt command and yield its standard output line by line as it runs.
+
+        Args:
+            cmd_args: Arguments following the ``dbt`` executable
+            timeout: Timeout in seconds
+            cwd: Working directory for the command
+
+        Yields:
+            Lines of standard output
+
+        Raises:
+            SubprocessError: If the command fails or times out
+        """
+        cmd_list = build_safe_command(["dbt"], cmd_args)
+        yield from stream_subprocess(cmd_list, timeout=timeout, cwd=cwd)
+
+    def invalidate(self) -> None:
+        """Nothing is cached between subprocess calls."""
+
+    def warm_up(self, target: Optional[str] = None, cwd: Optional[str] = None) -> None:
+        """Nothing can be preloaded for subprocess calls."""
+
+    def is_available(self) -> bool:
+        """Check whether the ``dbt`` executable can be run."""
+        return validate_dbt_available()
+
+
+class InProcessBackend:
+    """
+    Runs dbt commands through dbt-core's ``dbtRunner`` inside this process.
+
+    The project is parsed on first use (once per target) and the manifest is
+    handed to every subsequent runner, so dbt skips parsing entirely. dbt's
+    global state is not thread-safe, so invocations are serialised. Timeouts
+    are not enforced: a running invocation cannot be interrupted safely.
+    """
+
+    name = INPROCESS_ENGINE
+
+    def __init__(self):
+        try:
+            from dbt.cli.main import dbtRunner
+        except ImportError as e:
+            raise DbtProjectError(f"dbt-core's programmatic API is unavailable: {e}")
+        self._runner_class = dbtRunner
+        self._manifests: Dict[Optional[str], object] = {}
+        self._lock = threading.RLock()
+
+    def _target_of(self, cmd_args: List[str]) -> Optional[str]:
+        for flag in ("-t", "--target"):
+            if flag in cmd_args:
+                index = cmd_args.index(flag)
+                if index + 1 < len(cmd_args):
+                    return cmd_args[index + 1]
+        return None
+
+    def _manifest_for(self, target: Optional[str]):
+        manifest = self._manifests.get(target)
+        if manifest is None:
+            parse_args = ["--quiet", "parse"]
+            if target:
+                parse_args.extend(["-t", target])
+            result = self._runner_class().invoke(parse_args)
+            if not result.success or result.result is None:
+                raise SubprocessError(f"dbt parse failed: {result.exception}")
+            manifest = result.result
+            self._manifests[target] = manifest
+        return manifest
+
+    def invoke(self, cmd_args: List[str], timeout: Optional[int] = 300, cwd: Optional[str] = None) -> str:
+        """
+        Run a dbt command in-process and return what it printed.
+
+        ``timeout`` is accepted for interface compatibility; an in-process
+        invocation cannot be interrupted safely and runs to completion.
+
+        Args:
+            cmd_args: Arguments following the ``dbt`` executable
+            timeout: Ignored
+            cwd: Directory to run dbt from
+
+        Returns:
+            Command output (``ls`` results or printed macro output)
+
+        Raises:
+            SubprocessError: If the command fails
+        """
+        del timeout  # Accepted for interface compatibility only
+        with self._lock:
+            original_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                manifest = self._manifest_for(self._target_of(cmd_args))
+                runner = self._runner_class(manifest=manifest)
+
+                captured = io.StringIO()
+                with contextlib.redirect_stdout(captured):
+                    result = runner.invoke(list(cmd_args))
+            finally:
+                os.chdir(original_cwd)
+
+        if not result.success:
+            error = result.exception or "command reported failure"
+            raise SubprocessError(f"dbt {' '.join(cmd_args[:2])} failed in-process: {error}")
+
+        # `ls` returns its selection directly; everything else is printed
+        if isinstance(result.result, list):
+            return "\n".join(str(item) for item in result.result)
+        return captured.getvalue()
+
+    def stream(self, cmd_args: List[str], timeout: Optional[int] = 300, cwd: Optional[str] = None) -> Iterator[str]:
+        """
+        Run a dbt command in-process and yield its output line by line.
+
+        dbt's printed output can only be captured as a whole in-process, so
+        the lines are yielded once the command has finished.
+
+        Args:
+            cmd_args: Arguments following the ``dbt`` executable
+            timeout: Ignored
+            cwd: Directory to run dbt from
+
+        Yields:
+            Lines of command output
+
+        Raises:
+            SubprocessError: If the command fails
+        """
+        yield from self.invoke(cmd_args, timeout=timeout, cwd=cwd).splitlines(True)
+
+    def warm_up(self, target: Optional[str] = None, cwd: Optional[str] = None) -> None:
+        """
+        Parse the project now rather than on the first command.
+
+        Args:
+            target: dbt target to parse for
+            cwd: Directory to run dbt from
+        """
+        with self._lock:
+            original_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                self._manifest_for(target)
+            finally:
+                os.chdir(original_cwd)
+
+    def invalidate(self) -> None:
+        """Drop the preloaded manifests so the project is parsed again."""
+        with self._lock:
+            self._manifests.clear()
+
+    def is_available(self) -> bool:
+        """The API was importable when the backend was created."""
+        return True
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_dbt_backend(engine: Optional[str] = None):
+    """
+    Create an execution backend, falling back to subprocess when needed.
+
+    Args:
+        engine: ``subprocess`` or ``inprocess``; defaults to $DBT_YAMER_ENGINE
+
+    Returns:
+        A backend instance
+    """
+    engine = (engine or os.environ.get(ENGINE_ENV_VAR) or SUBPROCESS_ENGINE).lower()
+    if engine == INPROCESS_ENGINE:
+        try:
+            return InProcessBackend()
+        except DbtProjectError as e:
+            import click
+            click.echo(f"⚠️  {e}. Falling back to the subprocess engine.")
+    return SubprocessBackend()
+
+
+def set_dbt_backend(engine: Optional[str] = None):
+    """
+    Select the backend used by all dbt helpers in this process.
+
+    An existing backend for the same engine is kept, so whatever it has
+    preloaded survives repeated commands in a long-running process.
+
+    Args:
+        engine: ``subprocess`` or ``inprocess``; defaults to $DBT_YAMER_ENGINE
+
+    Returns:
+        The selected backend
+    """
+    global _backend
+    requested = (engine or os.environ.get(ENGINE_ENV_VAR) or SUBPROCESS_ENGINE).lower()
+    with _backend_lock:
+        if _backend is None or _backend.name != requested:
+            _backend = create_dbt_backend(requested)
+        return _backend
+
+
+def get_dbt_backend():
+    """
+    Return the active backend, creating the default one on first use.
+
+    Returns:
+        The active backend
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_dbt_backend()
+        return _backend
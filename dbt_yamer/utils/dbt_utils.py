@@ -1,20 +1,47 @@
 """
 Utility functions for dbt operations.
 """
-from typing import List
-from dbt_yamer.utils.subprocess_utils import run_subprocess
-from dbt_yamer.utils.security_utils import validate_tag_selector, validate_model_name, build_safe_command
+import json
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from dbt_yamer.utils.dbt_runner import get_dbt_backend
+from dbt_yamer.utils.subprocess_utils import STDERR_TAIL_LINES
+from dbt_yamer.utils.security_utils import validate_tag_selector, validate_model_name
 from dbt_yamer.exceptions import SubprocessError, ValidationError
 from dbt_yamer.handlers.file_handlers import find_dbt_project_root
+from dbt_yamer.handlers.manifest_index import ManifestIndex
 
+# Linux caps a single argv entry at 128 KiB (MAX_ARG_STRLEN); keep the JSON
+# passed to ``--args`` comfortably below that.
+MAX_OPERATION_ARGS_LENGTH = 100_000
 
-def expand_tag_selectors(selectors: List[str], target: str = None) -> List[str]:
+# Base timeout for a dbt run-operation, plus the extra time granted per model
+# when several models are introspected in one invocation.
+OPERATION_TIMEOUT = 300
+OPERATION_TIMEOUT_PER_MODEL = 5
+
+# Lines the generation macro prints around each model's YAML, followed by the
+# lower-cased model name. Must match the macro in dbt_yamer.macros.
+PAYLOAD_BEGIN = "__DBT_YAMER_BEGIN__"
+PAYLOAD_END = "__DBT_YAMER_END__"
+
+
+def expand_tag_selectors(
+    selectors: List[str],
+    target: str = None,
+    manifest_index: Optional[ManifestIndex] = None
+) -> List[str]:
     """
-    Expand tag selectors to actual model names using dbt ls command.
+    Expand tag selectors to actual model names.
+    
+    Tags are resolved from the manifest index when one is given; dbt ls is
+    only used without one. The result keeps the order in which models are
+    first selected and lists each model once.
     
     Args:
         selectors: List of model selectors (may include tag: selectors)
         target: Optional dbt target to use
+        manifest_index: Optional index built from the project's manifest
         
     Returns:
         List of expanded model names
@@ -26,59 +53,86 @@ def expand_tag_selectors(selectors: List[str], target: str = None) -> List[str]:
     if not selectors:
         return []
     
-    processed_models = []
+    processed_models = {}
     
     for selector in selectors:
         # Validate selector
         validated_selector = validate_tag_selector(selector)
         
         if validated_selector.startswith('tag:'):
-            # Expand tag selector
-            cmd_args = ["--quiet", "ls", "--select", validated_selector]
-            if target:
-                cmd_args.extend(["-t", target])
-                
-            # Find dbt project root to run command from correct directory
-            try:
-                project_root = find_dbt_project_root()
-            except Exception as e:
-                raise SubprocessError(f"Could not find dbt project root: {e}")
+            if manifest_index is not None:
+                tag_models = manifest_index.models_for_tag(validated_selector[4:])
+            else:
+                tag_models = _list_tag_models(validated_selector, target)
             
-            cmd_list = build_safe_command(["dbt"], cmd_args)
+            if not tag_models:
+                raise ValidationError(f"No models found for tag selector '{selector}'")
             
-            try:
-                result = run_subprocess(cmd_list, capture_output=True, timeout=60, cwd=str(project_root))
-                if result and result.stdout:
-                    # Split the fully qualified names and take the last part
-                    tag_models = [
-                        path.split('.')[-1] 
-                        for path in result.stdout.strip().splitlines()
-                        if path.strip()
-                    ]
-                    if not tag_models:
-                        raise ValidationError(f"No models found for tag selector '{selector}'")
-                    
-                    processed_models.extend(tag_models)
-                else:
-                    raise ValidationError(f"No output from dbt ls for selector '{selector}'")
-                    
-            except SubprocessError as e:
-                raise SubprocessError(f"Error expanding tag selector '{selector}': {e}")
+            processed_models.update(dict.fromkeys(tag_models))
         else:
             # Regular model name - validate it
             validated_model = validate_model_name(validated_selector)
-            processed_models.append(validated_model)
+            processed_models[validated_model] = None
     
-    return processed_models
+    return list(processed_models)
 
 
-def get_model_sql_path(model_name: str, target: str = None) -> str:
+def _list_tag_models(tag_selector: str, target: str = None) -> List[str]:
     """
-    Get the SQL file path for a dbt model using dbt ls command.
+    List the models selected by a tag selector with dbt ls.
+    
+    Args:
+        tag_selector: Validated ``tag:`` selector
+        target: Optional dbt target to use
+        
+    Returns:
+        Model names printed by dbt ls
+        
+    Raises:
+        ValidationError: If dbt ls prints nothing
+        SubprocessError: If dbt command fails
+    """
+    cmd_args = ["--quiet", "ls", "--resource-types", "model", "--select", tag_selector]
+    if target:
+        cmd_args.extend(["-t", target])
+        
+    # Find dbt project root to run command from correct directory
+    try:
+        project_root = find_dbt_project_root()
+    except Exception as e:
+        raise SubprocessError(f"Could not find dbt project root: {e}")
+    
+    try:
+        output = get_dbt_backend().invoke(cmd_args, timeout=60, cwd=str(project_root))
+    except SubprocessError as e:
+        raise SubprocessError(f"Error expanding tag selector '{tag_selector}': {e}")
+    
+    if not output:
+        raise ValidationError(f"No output from dbt ls for selector '{tag_selector}'")
+    
+    # Split the fully qualified names and take the last part
+    return [
+        path.split('.')[-1] 
+        for path in output.strip().splitlines()
+        if path.strip()
+    ]
+
+
+def get_model_sql_path(
+    model_name: str,
+    target: str = None,
+    manifest_index: Optional[ManifestIndex] = None
+) -> str:
+    """
+    Get the SQL file path for a dbt model.
+    
+    The path is read from the manifest index when one is given and knows the
+    model; otherwise it is resolved with the dbt ls command.
     
     Args:
         model_name: Name of the model
         target: Optional dbt target to use
+        manifest_index: Optional index built from the project's manifest
         
     Returns:
         Path to the SQL file
@@ -89,6 +143,11 @@ def get_model_sql_path(model_name: str, target: str = None) -> str:
     """
     validated_model = validate_model_name(model_name)
     
+    if manifest_index is not None:
+        indexed_path = manifest_index.get_model_path(validated_model)
+        if indexed_path:
+            return indexed_path
+    
     cmd_args = [
         "--quiet",
         "ls",
@@ -106,14 +165,12 @@ def get_model_sql_path(model_name: str, target: str = None) -> str:
     except Exception as e:
         raise SubprocessError(f"Could not find dbt project root: {e}")
     
-    cmd_list = build_safe_command(["dbt"], cmd_args)
-    
     try:
-        result = run_subprocess(cmd_list, capture_output=True, timeout=60, cwd=str(project_root))
-        if not result or not result.stdout:
+        output = get_dbt_backend().invoke(cmd_args, timeout=60, cwd=str(project_root))
+        if not output:
             raise SubprocessError(f"No output from dbt ls for model '{model_name}'")
         
-        paths = result.stdout.strip().splitlines()
+        paths = output.strip().splitlines()
         if not paths:
             raise ValidationError(f"Model '{model_name}' not found in dbt project")
         
@@ -123,10 +180,45 @@ def get_model_sql_path(model_name: str, target: str = None) -> str:
         raise SubprocessError(f"Error getting path for model '{model_name}': {e}")
 
 
+def extract_framed_payloads(output: str) -> Dict[str, str]:
+    """
+    Slice the per-model payloads framed by the generation macro out of dbt output.
+    
+    Only ``str.find`` and slicing are used, so the cost is linear in the output
+    size regardless of how much dbt logs around the payloads. A frame without
+    its end marker (e.g. output cut short by a crash) is ignored.
+    
+    Args:
+        output: Raw output from dbt
+        
+    Returns:
+        Dictionary mapping lower-cased model name to its YAML document
+    """
+    payloads = {}
+    begin = output.find(PAYLOAD_BEGIN)
+    
+    while begin != -1:
+        header_end = output.find("\n", begin)
+        if header_end == -1:
+            break
+        name = output[begin + len(PAYLOAD_BEGIN):header_end].strip().lower()
+        
+        end = output.find(f"{PAYLOAD_END} {name}", header_end)
+        if end == -1:
+            break
+        payloads[name] = output[header_end + 1:end]
+        begin = output.find(PAYLOAD_BEGIN, end)
+    
+    return payloads
+
+
 def extract_yaml_from_dbt_output(output: str) -> str:
     """
     Extract YAML content from dbt output by finding lines that form valid YAML.
     
+    Fallback for output without framed payloads, such as from a generation
+    macro installed by an older dbt-yamer.
+    
     Args:
         output: Raw output from dbt command containing logs and YAML
         
@@ -169,9 +261,69 @@ def extract_yaml_from_dbt_output(output: str) -> str:
     return '\n'.join(yaml_lines)
 
 
-def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> str:
+def iter_framed_payloads(
+    lines: Iterable[str],
+    log_tail: Optional[Deque[str]] = None
+) -> Iterator[Tuple[str, str]]:
     """
-    Run a dbt run-operation command safely using bash shell.
+    Yield framed model payloads from dbt output as soon as each one is complete.
+    
+    Incremental counterpart of ``extract_framed_payloads``: only the payload
+    being read is buffered, and everything outside frames is skipped.
+    
+    Args:
+        lines: dbt output lines, e.g. from a streaming backend
+        log_tail: Optional bounded deque that receives the lines outside frames
+        
+    Yields:
+        Tuples of (lower-cased model name, YAML document)
+    """
+    name = None
+    payload = []
+    
+    for line in lines:
+        if name is None and log_tail is not None and not line.startswith(PAYLOAD_BEGIN):
+            log_tail.append(line)
+        if line.startswith(PAYLOAD_BEGIN):
+            name = line[len(PAYLOAD_BEGIN):].strip().lower()
+            payload = []
+        elif name is not None:
+            if line.startswith(PAYLOAD_END) and line[len(PAYLOAD_END):].strip().lower() == name:
+                yield name, "".join(payload)
+                name = None
+                payload = []
+            else:
+                payload.append(line)
+
+
+def _log_messages(lines: Iterable[str]) -> List[str]:
+    """
+    Return the messages of dbt log lines, reading JSON logs' ``info.msg``.
+    
+    Args:
+        lines: Raw dbt log lines
+        
+    Returns:
+        Non-empty messages in their original order
+    """
+    messages = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                line = str(json.loads(line)["info"]["msg"]).strip()
+            except (ValueError, KeyError, TypeError):
+                pass
+        if line:
+            messages.append(line)
+    return messages
+
+
+def _operation_command(macro_name: str, args_dict: dict, target: str = None) -> Tuple[List[str], str]:
+    """
+    Build and validate the arguments of a dbt run-operation.
     
     Args:
         macro_name: Name of the macro to run
@@ -179,11 +331,11 @@ def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> s
         target: Optional dbt target to use
         
     Returns:
-        Output from the dbt command
+        Tuple of (dbt arguments, project root to run from)
         
     Raises:
         ValidationError: If validation fails
-        SubprocessError: If dbt command fails
+        SubprocessError: If the project root cannot be found
     """
     if not macro_name:
         raise ValidationError("Macro name cannot be empty")
@@ -192,7 +344,6 @@ def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> s
         raise ValidationError(f"Invalid macro name: {macro_name}")
     
     # Build JSON args safely
-    import json
     try:
         args_json = json.dumps(args_dict)
     except (TypeError, ValueError) as e:
@@ -204,9 +355,11 @@ def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> s
     except Exception as e:
         raise SubprocessError(f"Could not find dbt project root: {e}")
     
-    # Build command args
+    # Build command args. JSON logs keep dbt's own lines from ever looking
+    # like part of the macro's printed payload.
     cmd_args = [
         "--quiet",
+        "--log-format", "json",
         "run-operation",
         macro_name,
         "--args", args_json
@@ -216,15 +369,41 @@ def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> s
         validated_target = validate_model_name(target)  # Reuse validation logic
         cmd_args.extend(["-t", validated_target])
     
-    cmd_list = build_safe_command(["dbt"], cmd_args)
+    return cmd_args, str(project_root)
+
+
+def run_dbt_operation(
+    macro_name: str,
+    args_dict: dict,
+    target: str = None,
+    timeout: int = OPERATION_TIMEOUT
+) -> str:
+    """
+    Run a dbt run-operation command safely using bash shell.
+    
+    Args:
+        macro_name: Name of the macro to run
+        args_dict: Arguments to pass to the macro as a dictionary
+        target: Optional dbt target to use
+        timeout: Timeout in seconds for the dbt command
+        
+    Returns:
+        Output from the dbt command
+        
+    Raises:
+        ValidationError: If validation fails
+        SubprocessError: If dbt command fails
+    """
+    cmd_args, project_root = _operation_command(macro_name, args_dict, target)
     
     try:
-        result = run_subprocess(cmd_list, capture_output=True, timeout=300, cwd=str(project_root))
-        if not result:
-            raise SubprocessError("No result from dbt run-operation")
+        output = get_dbt_backend().invoke(cmd_args, timeout=timeout, cwd=project_root)
         
-        # Parse the output to extract only the YAML content
-        raw_output = result.stdout.strip()
+        # Framed payloads are left for split_models_yaml to slice out;
+        # otherwise extract the YAML document from the surrounding log lines
+        raw_output = output.strip()
+        if PAYLOAD_BEGIN in raw_output:
+            return raw_output
         yaml_content = extract_yaml_from_dbt_output(raw_output)
         
         if not yaml_content or not yaml_content.strip():
@@ -233,4 +412,171 @@ def run_dbt_operation(macro_name: str, args_dict: dict, target: str = None) -> s
         return yaml_content
         
     except SubprocessError as e:
-        raise SubprocessError(f"Error running dbt operation '{macro_name}': {e}")
\ No newline at end of file
+        raise SubprocessError(f"Error running dbt operation '{macro_name}': {e}")
+
+def stream_dbt_operation(
+    macro_name: str,
+    args_dict: dict,
+    target: str = None,
+    timeout: int = OPERATION_TIMEOUT
+) -> Iterator[Tuple[str, str]]:
+    """
+    Run a dbt run-operation and yield each framed model payload as dbt prints it.
+    
+    Lets callers write one model's file while dbt is still introspecting the
+    next. Backends that cannot stream deliver every payload at the end.
+    
+    Args:
+        macro_name: Name of the macro to run
+        args_dict: Arguments to pass to the macro as a dictionary
+        target: Optional dbt target to use
+        timeout: Timeout in seconds for the dbt command
+        
+    Yields:
+        Tuples of (lower-cased model name, YAML document)
+        
+    Raises:
+        ValidationError: If validation fails
+        SubprocessError: If dbt command fails
+    """
+    cmd_args, project_root = _operation_command(macro_name, args_dict, target)
+    # JSON logs go to stdout, so dbt's errors are among the lines outside frames
+    log_tail = deque(maxlen=STDERR_TAIL_LINES)
+    
+    try:
+        lines = get_dbt_backend().stream(cmd_args, timeout=timeout, cwd=project_root)
+        yield from iter_framed_payloads(lines, log_tail)
+    except SubprocessError as e:
+        error_msg = f"Error running dbt operation '{macro_name}': {e}"
+        log_lines = _log_messages(log_tail)[-3:]
+        if log_lines:
+            error_msg += f"\ndbt output: {'; '.join(log_lines)}"
+        raise SubprocessError(error_msg)
+
+
+def parse_model_payload(payload: str) -> Optional[dict]:
+    """
+    Parse one framed payload into its model entry.
+    
+    Args:
+        payload: JSON model document, or YAML document with a single-model
+            ``models`` list
+        
+    Returns:
+        The model entry, or None if the payload is not a valid model
+    """
+    if payload.lstrip().startswith("{"):
+        from dbt_yamer.handlers.model_entry import model_entry_from_json
+        try:
+            return model_entry_from_json(json.loads(payload))
+        except (ValueError, ValidationError):
+            return None
+    
+    import yaml
+    
+    try:
+        parsed = yaml.safe_load(payload)
+    except yaml.YAMLError:
+        return None
+    
+    if isinstance(parsed, dict) and parsed.get("models") and isinstance(parsed["models"][0], dict):
+        return parsed["models"][0]
+    return None
+
+
+def batch_model_names(
+    models: List[str],
+    batch_size: int,
+    max_args_length: int = MAX_OPERATION_ARGS_LENGTH
+) -> List[List[str]]:
+    """
+    Split model names into batches for a single dbt run-operation each.
+    
+    A batch is closed when it reaches ``batch_size`` models or when adding
+    another model would push the JSON ``--args`` payload past ``max_args_length``.
+    
+    Args:
+        models: Model names to split
+        batch_size: Maximum number of models per batch (values below 1 mean 1)
+        max_args_length: Maximum length of the serialized ``model_names`` argument
+        
+    Returns:
+        List of model name batches, preserving the input order
+    """
+    batch_size = max(1, batch_size)
+    batches = []
+    current = []
+    current_length = len(json.dumps({"model_names": []}))
+    
+    for model in models:
+        # Quoted name plus the ", " separator
+        model_length = len(json.dumps(model)) + 2
+        if current and (len(current) >= batch_size or current_length + model_length > max_args_length):
+            batches.append(current)
+            current = []
+            current_length = len(json.dumps({"model_names": []}))
+        current.append(model)
+        current_length += model_length
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+
+def operation_timeout(model_count: int) -> int:
+    """
+    Timeout for a run-operation introspecting ``model_count`` models.
+    
+    Args:
+        model_count: Number of models in the invocation
+        
+    Returns:
+        Timeout in seconds
+    """
+    return OPERATION_TIMEOUT + OPERATION_TIMEOUT_PER_MODEL * max(0, model_count - 1)
+
+
+def split_models_yaml(raw_yaml: str) -> Dict[str, dict]:
+    """
+    Split the YAML produced for several models into per-model entries.
+    
+    Framed output is parsed one model at a time, so a payload that fails to
+    parse only loses its own model; the caller retries it on its own.
+    
+    Args:
+        raw_yaml: Framed dbt output, or a YAML document with a top-level
+            ``models`` list
+        
+    Returns:
+        Dictionary mapping lower-cased model name to its model entry
+        
+    Raises:
+        ValidationError: If the YAML cannot be parsed or has no models
+    """
+    import yaml
+    
+    payloads = extract_framed_payloads(raw_yaml)
+    if payloads:
+        models = {}
+        for name, payload in payloads.items():
+            model_info = parse_model_payload(payload)
+            if model_info is not None:
+                models[name] = model_info
+        if not models:
+            raise ValidationError("None of the framed model payloads in dbt's output could be parsed")
+        return models
+    
+    try:
+        parsed = yaml.safe_load(raw_yaml)
+    except yaml.YAMLError as e:
+        raise ValidationError(f"Failed to parse dbt's YAML output: {e}")
+    
+    if not isinstance(parsed, dict) or not parsed.get("models"):
+        raise ValidationError("Invalid YAML structure - missing 'models' key")
+    
+    return {
+        str(model_info.get("name", "")).lower(): model_info
+        for model_info in parsed["models"]
+        if isinstance(model_info, dict)
+    }
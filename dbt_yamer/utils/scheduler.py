@@ -0,0 +1,125 @@
+"""
+Bounded concurrent execution of per-model work.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# One semaphore per dbt target, shared by every scheduler in the process so a
+# cap holds even when several commands run at once.
+_target_semaphores: Dict[Optional[str], threading.BoundedSemaphore] = {}
+_target_limits: Dict[Optional[str], int] = {}
+_registry_lock = threading.Lock()
+
+
+def set_target_concurrency(target: Optional[str], limit: int) -> None:
+    """
+    Cap the number of concurrent warehouse-bound dbt calls against a target.
+
+    Args:
+        target: dbt target name (None for the profile's default target)
+        limit: Maximum concurrent calls (at least 1)
+    """
+    limit = max(1, limit)
+    with _registry_lock:
+        if _target_limits.get(target) != limit:
+            _target_limits[target] = limit
+            _target_semaphores[target] = threading.BoundedSemaphore(limit)
+
+
+@contextmanager
+def target_slot(target: Optional[str]):
+    """
+    Hold one of the target's concurrency slots for the duration of the block.
+
+    Targets without a configured cap are not limited.
+
+    Args:
+        target: dbt target name
+    """
+    with _registry_lock:
+        semaphore = _target_semaphores.get(target)
+
+    if semaphore is None:
+        yield
+        return
+
+    with semaphore:
+        yield
+
+
+class ModelScheduler:
+    """
+    Runs work items on a bounded thread pool and reports results in order.
+
+    With a single thread everything runs inline on the calling thread, which
+    keeps the sequential behaviour (and tracebacks) of earlier releases.
+    """
+
+    def __init__(self, threads: int = 1):
+        self.threads = max(1, threads)
+
+    def run(
+        self,
+        func: Callable[[T], R],
+        items: Iterable[T]
+    ) -> Iterator[Tuple[T, Optional[R], Optional[BaseException]]]:
+        """
+        Apply ``func`` to every item, yielding results in input order.
+
+        A result is yielded as soon as it and every earlier item are done, so
+        output appears progressively but never out of order. Exceptions raised
+        by ``func`` are returned rather than raised.
+
+        Args:
+            func: Work function called once per item
+            items: Work items
+
+        Yields:
+            Tuples of (item, result, exception)
+        """
+        items = list(items)
+
+        if self.threads == 1 or len(items) <= 1:
+            for item in items:
+                try:
+                    yield item, func(item), None
+                except Exception as e:
+                    yield item, None, e
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=min(self.threads, len(items)))
+        futures = [executor.submit(func, item) for item in items]
+        try:
+            for item, future in zip(items, futures):
+                error = future.exception()
+                yield item, (None if error else future.result()), error
+        finally:
+            # Don't start queued work if the consumer stopped early, but always
+            # wait for running workers so callers can clean up after them.
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+def even_batch_size(item_count: int, batch_size: int, threads: int) -> int:
+    """
+    Shrink a batch size so the available threads all get work.
+
+    Args:
+        item_count: Number of items to split
+        batch_size: Requested maximum batch size
+        threads: Number of worker threads
+
+    Returns:
+        Batch size no larger than ``batch_size``
+    """
+    if threads <= 1 or item_count == 0:
+        return batch_size
+    per_thread = -(-item_count // threads)  # ceiling division
+    return max(1, min(batch_size, per_thread))
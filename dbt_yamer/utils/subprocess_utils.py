@@ -1,8 +1,13 @@
 import subprocess
 import shlex
-from typing import List, Optional, Dict, Any
+import threading
+from collections import deque
+from typing import List, Optional, Dict, Any, Iterator
 from dbt_yamer.exceptions import SubprocessError
 
+# Lines of stderr (or of dbt's log output) kept while streaming, for error messages
+STDERR_TAIL_LINES = 50
+
 
 def run_subprocess(
     cmd_list: List[str], 
@@ -86,4 +91,117 @@ def validate_dbt_available() -> bool:
         run_subprocess(['dbt', '--version'], capture_output=True, timeout=10)
         return True
     except SubprocessError:
-        return False 
\ No newline at end of file
+        return False 
+
+
+def stream_subprocess(
+    cmd_list: List[str],
+    timeout: Optional[int] = 300,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None
+) -> Iterator[str]:
+    """
+    Executes a command and yields its standard output line by line as it runs.
+    
+    Only the current line is held in memory, and the command runs with
+    ``PYTHONUNBUFFERED`` so its lines arrive as they are printed. stderr is
+    drained on a separate
+    thread (keeping its last lines for the error message) so a chatty command
+    can't block on a full pipe, and a watchdog kills the command once
+    ``timeout`` seconds have passed. If the consumer stops iterating early,
+    the command is killed.
+    
+    Args:
+        cmd_list: List of command arguments
+        timeout: Timeout in seconds for the whole command (None for no limit)
+        cwd: Working directory for the command
+        env: Environment variables (if None, uses the current environment)
+    
+    Yields:
+        Lines of standard output, including their line endings
+        
+    Raises:
+        SubprocessError: If the command cannot start, fails or times out
+    """
+    if not cmd_list:
+        raise SubprocessError("Command list cannot be empty")
+    
+    safe_cmd = ' '.join(shlex.quote(arg) for arg in cmd_list)
+    
+    import os
+    
+    if env is None:
+        env = os.environ.copy()
+    # A child writing to a pipe block-buffers its stdout; without this a
+    # Python command (dbt) would hold every line back until it exits
+    env.setdefault("PYTHONUNBUFFERED", "1")
+    
+    # Own process group, so a timeout also stops any children holding the pipe
+    use_process_group = hasattr(os, "killpg")
+    
+    try:
+        process = subprocess.Popen(
+            cmd_list,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+            env=env,
+            start_new_session=use_process_group
+        )
+    except OSError as e:
+        raise SubprocessError(f"Failed to execute command: {safe_cmd}. Error: {str(e)}")
+    
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    
+    def drain_stderr():
+        for line in process.stderr:
+            stderr_tail.append(line.rstrip('\n'))
+    
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+    
+    timed_out = threading.Event()
+    
+    def kill():
+        if use_process_group:
+            try:
+                import signal
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        process.kill()
+    
+    def kill_on_timeout():
+        timed_out.set()
+        kill()
+    
+    watchdog = threading.Timer(timeout, kill_on_timeout) if timeout else None
+    if watchdog is not None:
+        watchdog.daemon = True
+        watchdog.start()
+    
+    try:
+        for line in process.stdout:
+            yield line
+        process.wait()
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if process.poll() is None:
+            kill()
+            process.wait()
+        process.stdout.close()
+        stderr_thread.join()
+        process.stderr.close()
+    
+    if timed_out.is_set():
+        raise SubprocessError(f"Command timed out after {timeout} seconds: {safe_cmd}")
+    if process.returncode != 0:
+        error_msg = f"Command failed with exit code {process.returncode}: {safe_cmd}"
+        stderr_lines = [line for line in stderr_tail if line.strip()][-3:]
+        if stderr_lines:
+            error_msg += f"\nError details: {'; '.join(stderr_lines)}"
+        raise SubprocessError(error_msg)
@@ -156,6 +156,32 @@ else
     print_error "❌ dbt run command - FAILED"
 fi
 
+# Test that streamed payloads arrive while the command is still running,
+# with PYTHONUNBUFFERED unset as in a normal shell
+echo ""
+print_status "Testing streamed dbt output..."
+if docker-compose exec -T dbt env -u PYTHONUNBUFFERED python - <<'EOF'
+import sys
+import time
+from dbt_yamer.utils.dbt_utils import iter_framed_payloads
+from dbt_yamer.utils.subprocess_utils import stream_subprocess
+
+child = (
+    "import time\n"
+    "print('__DBT_YAMER_BEGIN__ first'); print('x: 1'); print('__DBT_YAMER_END__ first')\n"
+    "time.sleep(2)\n"
+    "print('__DBT_YAMER_BEGIN__ second'); print('x: 2'); print('__DBT_YAMER_END__ second')\n"
+)
+start = time.time()
+arrivals = [time.time() - start for _ in iter_framed_payloads(stream_subprocess([sys.executable, "-c", child]))]
+sys.exit(0 if len(arrivals) == 2 and arrivals[0] < 1 else 1)
+EOF
+then
+    print_success "✅ Streamed dbt output - PASSED"
+else
+    print_error "❌ Streamed dbt output - FAILED"
+fi
+
 # Test security features
 echo ""
 print_status "Testing security validations..."